@@ -13,10 +13,23 @@ class Settings:
     MODEL_BACKEND: str = os.getenv("MODEL_BACKEND", "none")  # hf | gpt4all | none
     HF_MODEL_NAME: str = os.getenv("HF_MODEL_NAME", "google/flan-t5-base")
     GPT4ALL_MODEL_PATH: str = os.getenv("GPT4ALL_MODEL_PATH", os.path.join(DATA_DIR, "models", "ggml-gpt4all-j-v1.3-groovy.bin"))
+    # Load the GPT4All model at server boot instead of on the first /sop/generate (opt-in)
+    EAGER_WARMUP: bool = os.getenv("EAGER_WARMUP", "false").lower() in ("1", "true", "yes")
 
 
 settings = Settings()
 
-# Ensure directories exist
-for directory in (settings.DATA_DIR, settings.UPLOAD_DIR, settings.PROJECTS_DIR, settings.SOPS_DIR, os.path.dirname(settings.GPT4ALL_MODEL_PATH)):
-    os.makedirs(directory, exist_ok=True)
+
+def _ensure_directories() -> None:
+    # The marker is written after the first successful run, so later worker boots
+    # skip the makedirs calls. Storage helpers still create their own dirs on write.
+    marker = os.path.join(settings.DATA_DIR, ".dirs_ready")
+    if os.path.exists(marker):
+        return
+    for directory in (settings.DATA_DIR, settings.UPLOAD_DIR, settings.PROJECTS_DIR, settings.SOPS_DIR, os.path.dirname(settings.GPT4ALL_MODEL_PATH)):
+        os.makedirs(directory, exist_ok=True)
+    with open(marker, "a", encoding="utf-8"):
+        pass
+
+
+_ensure_directories()
@@ -1,10 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.responses import Response
 from config import settings
+from utils.responses import ORJSONResponse
 from routers.sop import router as sop_router
 from routers.docs import router as docs_router
+from services import ai_service
 
-app = FastAPI(title="SOP Generator", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.EAGER_WARMUP:
+        ai_service.ensure_backend_loaded()
+    yield
+
+
+app = FastAPI(title="SOP Generator", version="0.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,9 +26,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+_HEALTH_BODY = b'{"status":"ok"}'
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    # Pre-encoded body; a fresh Response per call because middleware mutates headers
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 app.include_router(sop_router, prefix="/api")
-app.include_router(docs_router, prefix="/api")
\ No newline at end of file
+app.include_router(docs_router, prefix="/api")
+
+# Build the schema once at import instead of on the first /openapi.json hit
+app.openapi_schema = app.openapi()
@@ -1,8 +1,16 @@
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
-class SOPSection(BaseModel):
+# Request bodies: validation happens once on parse, never on assignment.
+_REQUEST_CONFIG = ConfigDict(validate_assignment=False, extra="ignore")
+
+
+# Small server-built value objects are plain dataclasses; Pydantic models are kept
+# for request bodies and SOPDocument, which still need validation/coercion.
+@dataclass(slots=True, frozen=True)
+class SOPSection:
     title: str
     content: str
 
@@ -15,6 +23,8 @@ class SOPDocument(BaseModel):
 
 
 class GenerateRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     project_id: str
     project_description: Optional[str] = None
     template: Optional[Dict[str, Any]] = None
@@ -27,19 +37,24 @@ class UploadResponse(BaseModel):
     message: str
 
 
-class ListItem(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ListItem:
     id: str
     project_name: str
     modified_ts: float
 
 
 class DocsIngestRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     project_id: str
     curls_text: Optional[str] = None  # single text with one or many cURL commands
     curls: Optional[List[str]] = None  # array of individual curl commands
 
 
 class DocsGenerateRequest(BaseModel):
+    model_config = _REQUEST_CONFIG
+
     project_id: str
     project_name: Optional[str] = None
     base_url: Optional[str] = None
@@ -1,30 +1,41 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import PlainTextResponse, JSONResponse
+from fastapi.responses import PlainTextResponse, Response
 from fastapi.responses import FileResponse
 from typing import Dict, Any
 from models.schemas import DocsIngestRequest, DocsGenerateRequest
 from services import storage_service
 from services import docs_service
-import os
-import tempfile
+from utils.responses import ORJSONResponse
+from urllib.parse import quote
 
 
 router = APIRouter(prefix="/docs", tags=["docs"])
 
 
+def _attachment_headers(filename: str) -> Dict[str, str]:
+    # Same Content-Disposition encoding FileResponse uses for non-ASCII names
+    quoted = quote(filename)
+    if quoted != filename:
+        return {"Content-Disposition": f"attachment; filename*=utf-8''{quoted}"}
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+# Parsing, rendering, PDF/DOCX export and reading stored docs off disk all block, so
+# every handler here is plain `def` and runs in Starlette's threadpool instead of on
+# the event loop.
 @router.post("/ingest")
-async def ingest_curls(payload: DocsIngestRequest) -> Dict[str, Any]:
+def ingest_curls(payload: DocsIngestRequest) -> Dict[str, Any]:
     project_dir = storage_service.get_project_dir(payload.project_id)
     if project_dir is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    parsed = docs_service.parse_curl_inputs(payload)
+    parsed = docs_service.parse_curls(payload.curls_text, payload.curls)
     storage_service.save_docs_inputs(payload.project_id, parsed)
     return {"ok": True, "endpoints": len(parsed.get("requests", []))}
 
 
 @router.post("/generate")
-async def generate_docs(payload: DocsGenerateRequest) -> Dict[str, Any]:
+def generate_docs(payload: DocsGenerateRequest) -> Dict[str, Any]:
     project_dir = storage_service.get_project_dir(payload.project_id)
     if project_dir is None:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -48,30 +59,32 @@ async def generate_docs(payload: DocsGenerateRequest) -> Dict[str, Any]:
 
 
 @router.get("/openapi.json")
-async def get_openapi(project_id: str):
-    data = storage_service.load_docs_openapi(project_id)
-    if not data:
+def get_openapi(project_id: str):
+    path = storage_service.get_docs_openapi_path(project_id)
+    if path is None:
         raise HTTPException(status_code=404, detail="No OpenAPI for project")
-    return JSONResponse(content=data)
+    # Stored pre-serialized by save_docs_openapi, so serve the bytes without re-encoding
+    return FileResponse(path, media_type="application/json")
 
 
 @router.get("/markdown", response_class=PlainTextResponse)
-async def get_markdown(project_id: str):
-    md = storage_service.load_docs_markdown(project_id)
-    if md is None:
+def get_markdown(project_id: str):
+    path = storage_service.get_docs_markdown_path(project_id)
+    if path is None:
         raise HTTPException(status_code=404, detail="No Markdown for project")
-    return md
+    # Served straight from disk like openapi.json; save_docs_markdown writes UTF-8
+    return FileResponse(path, media_type="text/plain")
 
 
 @router.post("/generate-inline")
-async def generate_docs_inline(payload: Dict[str, Any]) -> Dict[str, Any]:
+def generate_docs_inline(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Generate OpenAPI + Markdown directly from provided cURL(s) without a project.
 
     Body supports:
     { "curls_text": "..." } or { "curls": ["curl ...", "curl ..."] }
     Optional: { "base_url": "https://api.example.com" }
     """
-    parsed = docs_service.parse_curl_inputs(type("Obj", (), payload))  # simple adapter for existing fn
+    parsed = docs_service.parse_curl_inputs_dict(payload)
     requests = parsed.get("requests", [])
     if not requests:
         raise HTTPException(status_code=400, detail="No cURL commands provided")
@@ -82,16 +95,16 @@ async def generate_docs_inline(payload: Dict[str, Any]) -> Dict[str, Any]:
         ai_enabled=True,
     )
     md = docs_service.render_markdown_from_openapi(openapi_doc, style=(payload.get("format") or payload.get("style") or "vendor"))
-    return {"openapi": openapi_doc, "markdown": md}
+    return ORJSONResponse(content={"openapi": openapi_doc, "markdown": md})
 
 
 @router.post("/export")
-async def export_docs(payload: Dict[str, Any]):
+def export_docs(payload: Dict[str, Any]):
     """Generate docs from cURL and return as a downloadable file.
 
     Body: { curls_text|curls, base_url?, format? (default), ai_enabled?, output: 'pdf'|'docx'|'md' }
     """
-    parsed = docs_service.parse_curl_inputs(type("Obj", (), payload))
+    parsed = docs_service.parse_curl_inputs_dict(payload)
     requests = parsed.get("requests", [])
     if not requests:
         raise HTTPException(status_code=400, detail="No cURL commands provided")
@@ -105,27 +118,22 @@ async def export_docs(payload: Dict[str, Any]):
     md = docs_service.render_markdown_from_openapi(openapi_doc, style=style)
     output = (payload.get("output") or "pdf").lower()
 
+    fname_base = (openapi_doc.get("info", {}).get("title") or "api-docs").replace(' ', '-').lower()
+
+    # Everything is rendered in memory and sent directly; no temp files on disk
     if output == "md":
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".md", mode="w", encoding="utf-8") as tmp:
-            tmp.write(md)
-            path = tmp.name
-        fname = (openapi_doc.get("info", {}).get("title") or "api-docs").replace(' ', '-').lower() + ".md"
-        return FileResponse(path, filename=fname, media_type="text/markdown")
+        return Response(content=md.encode("utf-8"), media_type="text/markdown", headers=_attachment_headers(fname_base + ".md"))
 
     if output == "docx":
         try:
-            path = docs_service.generate_docx(md)
-            fname = (openapi_doc.get("info", {}).get("title") or "api-docs").replace(' ', '-').lower() + ".docx"
-            return FileResponse(path, filename=fname, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+            content = docs_service.generate_docx(md)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"DOCX generation failed: {e}")
+        return Response(content=content, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document", headers=_attachment_headers(fname_base + ".docx"))
 
     # default PDF
     try:
-        path = docs_service.generate_pdf(md)
-        fname = (openapi_doc.get("info", {}).get("title") or "api-docs").replace(' ', '-').lower() + ".pdf"
-        return FileResponse(path, filename=fname, media_type="application/pdf")
+        content = docs_service.generate_pdf(md)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation failed: {e}")
-
-
+    return Response(content=content, media_type="application/pdf", headers=_attachment_headers(fname_base + ".pdf"))
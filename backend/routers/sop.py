@@ -1,13 +1,22 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import PlainTextResponse
-import uuid
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+from pydantic import TypeAdapter
 from typing import Dict, Any
 from models.schemas import UploadResponse, GenerateRequest, SOPDocument, ListItem
-from services import storage_service, parsing_service, ai_service
+from services import storage_service, parsing_service, ai_service, job_service
 from utils.zip_utils import save_and_extract_zip
+from utils.ids import new_id
 
 router = APIRouter(prefix="/sop", tags=["sop"])
 
+# Built once so the compiled pydantic-core serializers are reused across requests
+_SOP_ADAPTER = TypeAdapter(SOPDocument)
+_LIST_ITEMS_ADAPTER = TypeAdapter(list[ListItem])
+
+
+def _json_response(payload: bytes) -> Response:
+    return Response(content=payload, media_type="application/json")
+
 
 @router.get("/ai/backends")
 async def available_backends():
@@ -22,11 +31,12 @@ async def set_backend(payload: Dict[str, Any]):
     return ai_service.set_backend(backend, hf_model, gpt_path)
 
 
+# Handlers doing blocking disk/CPU work are plain `def` so Starlette runs them in its threadpool
 @router.post("/upload", response_model=UploadResponse)
-async def upload_project(file: UploadFile = File(...)):
+def upload_project(file: UploadFile = File(...)):
     if not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Only .zip files are supported")
-    project_id = str(uuid.uuid4())
+    project_id = new_id()
     project_name = file.filename[:-4]
     save_and_extract_zip(file, project_id)
     # Save initial metadata with project_name so later SOPs display a friendly name
@@ -35,7 +45,7 @@ async def upload_project(file: UploadFile = File(...)):
 
 
 @router.post("/parse/{project_id}")
-async def parse_project(project_id: str) -> Dict[str, Any]:
+def parse_project(project_id: str) -> Dict[str, Any]:
     project = storage_service.get_project_dir(project_id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -48,11 +58,12 @@ async def parse_project(project_id: str) -> Dict[str, Any]:
     return metadata
 
 
-@router.post("/generate", response_model=SOPDocument)
-async def generate_sop(request: GenerateRequest):
-    project_dir = storage_service.get_project_dir(request.project_id)
-    if project_dir is None:
+def _require_project(project_id: str) -> None:
+    if storage_service.get_project_dir(project_id) is None:
         raise HTTPException(status_code=404, detail="Project not found")
+
+
+def _generate_and_save(request: GenerateRequest) -> SOPDocument:
     metadata = storage_service.load_project_metadata(request.project_id)
     sop = ai_service.generate_sop_document(
         project_id=request.project_id,
@@ -65,29 +76,60 @@ async def generate_sop(request: GenerateRequest):
     return sop
 
 
+@router.post("/generate", response_model=SOPDocument)
+def generate_sop(request: GenerateRequest):
+    _require_project(request.project_id)
+    sop = _generate_and_save(request)
+    # Returning a Response skips outgoing validation; response_model only documents the shape
+    return _json_response(_SOP_ADAPTER.dump_json(sop))
+
+
+# Background variant of /generate for slow model backends: returns a job id to poll
+@router.post("/jobs", status_code=202)
+def enqueue_generate_sop(request: GenerateRequest) -> Dict[str, Any]:
+    _require_project(request.project_id)
+    job_id = job_service.submit(_generate_and_save, request)
+    if job_id is None:
+        raise HTTPException(status_code=503, detail="Too many generation jobs in progress", headers={"Retry-After": "30"})
+    return {"job_id": job_id, "status": "pending"}
+
+
+@router.get("/jobs/{job_id}")
+async def get_generate_job(job_id: str):
+    status = job_service.get_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if status["status"] == "done":
+        status["result"] = status["result"].model_dump(mode="json")
+    return status
+
+
 @router.get("/list", response_model=list[ListItem])
-async def list_sops():
-    return storage_service.list_sops()
+def list_sops():
+    return _json_response(_LIST_ITEMS_ADAPTER.dump_json(storage_service.list_sops()))
 
 
+# Parametrised routes must stay below every static /sop/* path: Starlette matches
+# routes in declaration order, so /{sop_id} would otherwise shadow e.g. /list.
 @router.get("/{sop_id}", response_model=SOPDocument)
-async def get_sop(sop_id: str):
+def get_sop(sop_id: str):
     sop = storage_service.load_sop(sop_id)
     if sop is None:
         raise HTTPException(status_code=404, detail="SOP not found")
-    return sop
+    return _json_response(_SOP_ADAPTER.dump_json(sop))
 
 
 @router.get("/{sop_id}/markdown", response_class=PlainTextResponse)
-async def get_sop_markdown(sop_id: str):
-    md = storage_service.load_sop_markdown(sop_id)
-    if md is None:
+def get_sop_markdown(sop_id: str):
+    path = storage_service.get_sop_markdown_path(sop_id)
+    if path is None:
         raise HTTPException(status_code=404, detail="SOP markdown not found")
-    return md
+    # Served straight from disk; save_sop already wrote it as UTF-8
+    return FileResponse(path, media_type="text/plain")
 
 
 @router.delete("/{sop_id}")
-async def delete_sop(sop_id: str):
+def delete_sop(sop_id: str):
     removed = storage_service.delete_sop(sop_id)
     if not removed:
         raise HTTPException(status_code=404, detail="SOP not found")
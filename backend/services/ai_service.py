@@ -1,50 +1,77 @@
-from typing import Dict, Any, List, Optional
+import hashlib
+import importlib.util
+import logging
+import re
+import threading
+from io import StringIO
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Dict, Any, Final, List, NamedTuple, Optional, Tuple
+import orjson
 from models.schemas import SOPSection, SOPDocument
 from config import settings
-import uuid
+from utils.ids import new_id
+
+logger = logging.getLogger(__name__)
+
+# Generated SOP content keyed by _sop_cache_key: (sections, metadata) tuples, LRU-evicted
+_SOP_CACHE_MAX = 128
+_sop_cache: "OrderedDict[bytes, Tuple[Tuple[SOPSection, ...], Dict[str, Any]]]" = OrderedDict()
+_sop_cache_lock = threading.Lock()
+
+
+def _sop_cache_get(key: bytes) -> Optional[Tuple[Tuple[SOPSection, ...], Dict[str, Any]]]:
+    with _sop_cache_lock:
+        value = _sop_cache.get(key)
+        if value is not None:
+            _sop_cache.move_to_end(key)
+        return value
+
+
+def _sop_cache_put(key: bytes, value: Tuple[Tuple[SOPSection, ...], Dict[str, Any]]) -> None:
+    with _sop_cache_lock:
+        _sop_cache[key] = value
+        _sop_cache.move_to_end(key)
+        if len(_sop_cache) > _SOP_CACHE_MAX:
+            _sop_cache.popitem(last=False)
+
+
+# Section headers recognised in free-form AI output. One alternation replaces the old
+# per-pattern loop; like before it is unanchored, so a header may appear anywhere in a line.
+_SECTION_HEADER_RE = re.compile(
+    r'#+\s*(?:Introduction|Overview'
+    r'|Tech Stack|Architecture|Technology'
+    r'|Setup|Installation|Getting Started'
+    r'|API|Endpoints|Documentation'
+    r'|Development|Workflow|Process'
+    r'|Testing|Tests'
+    r'|Deployment|Deploy|Production'
+    r'|Troubleshooting|Issues|Problems'
+    r'|Maintenance|Best Practices|Guidelines)',
+    re.IGNORECASE,
+)
+_STRIP_HASHES_RE = re.compile(r'^#+\s*')
+# Context fields written into the prompt by _ai_enhance_sections
+_PROMPT_FIELD_RE = re.compile(r'^(PROJECT|TECH STACK|API ENDPOINTS):[ \t]*(.*)$', re.MULTILINE)
+# Route kinds produced by parsing_service that count as API endpoints
+_API_KINDS: Tuple[str, ...] = ("spring", "express", "fastapi", "laravel")
+
+
+def _fast_strip(text: str) -> str:
+    # Server-built content is usually already trimmed; only copy when an end is whitespace
+    if not text or (not text[0].isspace() and not text[-1].isspace()):
+        return text
+    return text.strip()
 
 
 def _render_markdown(sections: List[SOPSection]) -> str:
-    lines: List[str] = []
-    for s in sections:
-        lines.append(f"## {s.title}")
-        lines.append("")
-        lines.append(s.content.strip())
-        lines.append("")
-    return "\n".join(lines).strip() + "\n"
+    return "\n".join(chain.from_iterable((f"## {s.title}", "", _fast_strip(s.content), "") for s in sections)).strip() + "\n"
 
 
-def _try_hf_generate(prompt: str) -> Optional[str]:
-    try:
-        print(f"Generating AI content with HuggingFace model: {settings.HF_MODEL_NAME}")
-        
-        # For now, use a simple rule-based approach that generates dynamic content
-        # based on the prompt content instead of hardcoded responses
-        print("Using dynamic rule-based generation (PyTorch not available)")
-        
-        # Extract project context from prompt
-        project_name = "Unknown"
-        tech_stack = "Unknown"
-        api_count = 0
-        
-        # Parse prompt to extract information
-        lines = prompt.split('\n')
-        for line in lines:
-            if line.startswith('PROJECT:'):
-                project_name = line.replace('PROJECT:', '').strip()
-            elif line.startswith('TECH STACK:'):
-                tech_stack = line.replace('TECH STACK:', '').strip()
-            elif 'API ENDPOINTS:' in line:
-                try:
-                    api_count = int(line.split(':')[1].split()[0])
-                except:
-                    api_count = 0
-        
-        print(f"Parsed project_name: {project_name}, tech_stack: {tech_stack}")
-        
-        # Generate dynamic content based on project context
-        if "javascript" in tech_stack.lower() or "typescript" in tech_stack.lower() or "express" in tech_stack.lower() or "node" in tech_stack.lower():
-            return f"""## Node.js/Express Project Insights
+# Canned insights returned by the rule-based HF path. Module constants, so each call
+# returns the same str object instead of rebuilding the literal.
+_TPL_NODE_SPRING: Final[str] = """## Node.js/Express Project Insights
 
 **Architecture Patterns:**
 - Implement layered architecture with clear separation of concerns
@@ -82,8 +109,7 @@ def _try_hf_generate(prompt: str) -> Optional[str]:
 - Log aggregation and analysis
 - Automated testing in CI/CD pipeline"""
 
-        elif "node" in tech_stack.lower() or "express" in tech_stack.lower():
-            return f"""## Node.js/Express Project Insights
+_TPL_NODE: Final[str] = """## Node.js/Express Project Insights
 
 **Architecture Patterns:**
 - Implement MVC pattern for better code organization
@@ -121,47 +147,7 @@ def _try_hf_generate(prompt: str) -> Optional[str]:
 - Log management with Winston
 - Automated testing and deployment"""
 
-        elif "spring" in tech_stack.lower() or "java" in tech_stack.lower():
-            return f"""## Node.js/Express Project Insights
-
-**Architecture Patterns:**
-- Implement layered architecture with clear separation of concerns
-- Use Express.js middleware for rapid development
-- Apply dependency injection for loose coupling
-- Consider microservices architecture for scalability
-
-**Performance Bottlenecks:**
-- Database connection pooling configuration
-- JPA lazy loading optimization
-- Memory management for large datasets
-- Caching strategies with Redis or Hazelcast
-
-**Security Vulnerabilities:**
-- Implement Spring Security for authentication/authorization
-- Validate all input data with @Valid annotations
-- Use HTTPS in production environments
-- Implement rate limiting for API endpoints
-
-**Testing Strategies:**
-- Unit tests with JUnit 5 and Mockito
-- Integration tests with @SpringBootTest
-- API testing with @WebMvcTest
-- Contract testing for microservices
-
-**Deployment Issues:**
-- Container configuration for Docker/Kubernetes
-- Environment-specific configuration management
-- Database migration strategies
-- Health check endpoints for monitoring
-
-**Maintenance Recommendations:**
-- Regular dependency updates
-- Performance monitoring with Actuator
-- Log aggregation and analysis
-- Automated testing in CI/CD pipeline"""
-
-        elif "python" in tech_stack.lower() or "fastapi" in tech_stack.lower():
-            return f"""## Python/FastAPI Project Insights
+_TPL_PYTHON: Final[str] = """## Python/FastAPI Project Insights
 
 **Architecture Patterns:**
 - Implement dependency injection with FastAPI
@@ -199,8 +185,7 @@ def _try_hf_generate(prompt: str) -> Optional[str]:
 - Log management and analysis
 - Automated testing pipeline"""
 
-        else:
-            return f"""## General Software Project Insights
+_TPL_GENERAL: Final[str] = """## General Software Project Insights
 
 **Architecture Patterns:**
 - Implement clean architecture principles
@@ -237,19 +222,79 @@ def _try_hf_generate(prompt: str) -> Optional[str]:
 - Dependency updates
 - Performance monitoring
 - Documentation maintenance"""
-            
+
+# The JS/TS branch has always returned the Node heading over the Spring/Java advice,
+# which is also what the Spring branch returns; both keys share one constant.
+_STACK_TEMPLATES: Dict[str, str] = {
+    "node_spring": _TPL_NODE_SPRING,
+    "node": _TPL_NODE,
+    "spring": _TPL_NODE_SPRING,
+    "python": _TPL_PYTHON,
+    "general": _TPL_GENERAL,
+}
+
+# First match wins, so order matters; "node" is shadowed by "node_spring" but kept for parity.
+_STACK_RULES = (
+    ("node_spring", ("javascript", "typescript", "express", "node")),
+    ("node", ("node", "express")),
+    ("spring", ("spring", "java")),
+    ("python", ("python", "fastapi")),
+)
+
+
+def _try_hf_generate(prompt: str) -> Optional[str]:
+    try:
+        logger.debug("Generating AI content with HuggingFace model: %s", settings.HF_MODEL_NAME)
+        
+        # For now, use a simple rule-based approach that generates dynamic content
+        # based on the prompt content instead of hardcoded responses
+        logger.debug("Using dynamic rule-based generation (PyTorch not available)")
+        
+        # Extract project context from prompt in one scan; later lines win, as before
+        fields = {m.group(1): m.group(2).strip() for m in _PROMPT_FIELD_RE.finditer(prompt)}
+        project_name = fields.get('PROJECT', "Unknown")
+        tech_stack = fields.get('TECH STACK', "Unknown")
+        try:
+            api_count = int(fields.get('API ENDPOINTS', '0').split()[0], 10)
+        except (IndexError, ValueError):
+            api_count = 0
+        
+        logger.debug("Parsed project_name: %s, tech_stack: %s", project_name, tech_stack)
+        
+        # Generate dynamic content based on project context
+        tl = tech_stack.lower()
+        for key, keywords in _STACK_RULES:
+            if any(kw in tl for kw in keywords):
+                return _STACK_TEMPLATES[key]
+        return _STACK_TEMPLATES["general"]
+
     except Exception as e:
-        print(f"Dynamic AI generation failed: {e}")
+        logger.warning("Dynamic AI generation failed: %s", e)
         return None
 
 
+# Loaded GPT4All models keyed by model path. Loading maps gigabytes of weights, so a
+# model is built once and reused; each entry carries an RLock because a model's chat
+# session is not safe to share between the threadpool workers generating at once.
+_gpt4all_cache: Dict[str, Tuple[Any, threading.RLock]] = {}
+_gpt4all_cache_lock = threading.Lock()
+
+
+def _get_gpt4all_model(path: str) -> Tuple[Any, threading.RLock]:
+    with _gpt4all_cache_lock:
+        entry = _gpt4all_cache.get(path)
+        if entry is None:
+            from gpt4all import GPT4All
+            entry = (GPT4All(model_name=path), threading.RLock())
+            _gpt4all_cache[path] = entry
+        return entry
+
+
 def _try_gpt4all_generate(prompt: str) -> Optional[str]:
     try:
-        print(f"Generating AI content with GPT4All model: {settings.GPT4ALL_MODEL_PATH}")
-        from gpt4all import GPT4All
-        
-        model = GPT4All(model_name=settings.GPT4ALL_MODEL_PATH)
-        with model.chat_session():
+        logger.debug("Generating AI content with GPT4All model: %s", settings.GPT4ALL_MODEL_PATH)
+        model, model_lock = _get_gpt4all_model(settings.GPT4ALL_MODEL_PATH)
+        with model_lock, model.chat_session():
             response = model.generate(
                 prompt, 
                 max_tokens=400, 
@@ -257,39 +302,61 @@ def _try_gpt4all_generate(prompt: str) -> Optional[str]:
                 top_p=0.9,
                 repeat_penalty=1.1
             )
-            print(f"GPT4All generated response length: {len(response)} characters")
+            logger.debug("GPT4All generated response length: %d characters", len(response))
             return response.strip() if response else None
     except Exception as e:
-        print(f"GPT4All AI generation failed: {e}")
+        logger.warning("GPT4All AI generation failed: %s", e)
         return None
 
 
+class _Backends(NamedTuple):
+    hf: bool
+    gpt4all: bool
+
+
+# Importability can't change without a restart (set_backend only picks among them),
+# so the probe runs once per process.
+@lru_cache(maxsize=1)
+def _probe_backends() -> _Backends:
+    # find_spec only locates the package; importing transformers here would cost seconds
+    return _Backends(
+        hf=importlib.util.find_spec("transformers") is not None,
+        gpt4all=importlib.util.find_spec("gpt4all") is not None,
+    )
+
+
 def list_available_backends() -> Dict[str, bool]:
-    available = {"hf": False, "gpt4all": False}
-    try:
-        import transformers  # noqa: F401
-        available["hf"] = True
-    except Exception:
-        pass
-    try:
-        import gpt4all  # noqa: F401
-        available["gpt4all"] = True
-    except Exception:
-        pass
-    return available
+    # Public shape stays a {"hf": bool, "gpt4all": bool} mapping for the /ai/backends route
+    return _probe_backends()._asdict()
 
 
 def _detect_backend() -> str:
     if settings.MODEL_BACKEND in ("hf", "gpt4all"):
         return settings.MODEL_BACKEND
-    available = list_available_backends()
-    if available["hf"]:
+    available = _probe_backends()
+    if available.hf:
         return "hf"
-    if available["gpt4all"]:
+    if available.gpt4all:
         return "gpt4all"
     return "none"
 
 
+def ensure_backend_loaded() -> str:
+    """Pay the selected backend's load cost up front; returns the backend name.
+
+    Only GPT4All has anything to warm: its configured model is loaded into the model
+    cache so that latency lands at boot rather than on the first generate. The "hf"
+    path is rule-based and never imports transformers, so there is nothing to load.
+    """
+    backend = _detect_backend()
+    if backend == "gpt4all":
+        try:
+            _get_gpt4all_model(settings.GPT4ALL_MODEL_PATH)
+        except Exception as e:
+            logger.warning("AI backend warmup failed for %s: %s", backend, e)
+    return backend
+
+
 def set_backend(backend: str, hf_model_name: Optional[str] = None, gpt4all_model_path: Optional[str] = None) -> Dict[str, Any]:
     backend = backend.lower()
     if backend not in ("hf", "gpt4all", "none"):
@@ -297,11 +364,33 @@ def set_backend(backend: str, hf_model_name: Optional[str] = None, gpt4all_model
     settings.MODEL_BACKEND = backend
     if hf_model_name:
         settings.HF_MODEL_NAME = hf_model_name
-    if gpt4all_model_path:
+    if gpt4all_model_path and gpt4all_model_path != settings.GPT4ALL_MODEL_PATH:
+        # Drop the old model so its weights are freed rather than held for a path no longer used
+        with _gpt4all_cache_lock:
+            _gpt4all_cache.pop(settings.GPT4ALL_MODEL_PATH, None)
         settings.GPT4ALL_MODEL_PATH = gpt4all_model_path
     return {"ok": True, "backend": settings.MODEL_BACKEND, "hf_model_name": settings.HF_MODEL_NAME, "gpt4all_model_path": settings.GPT4ALL_MODEL_PATH}
 
 
+@lru_cache(maxsize=32)
+def _joined_sorted(items: Tuple[str, ...]) -> str:
+    # Language/framework lists repeat across generations, so the sorted join is memoized
+    return ", ".join(sorted(items))
+
+
+def _render_template_sections(template: Dict[str, Any], metadata: Dict[str, Any], description: str | None) -> List[SOPSection]:
+    """Render a custom template's sections, substituting {metadata} and {description}."""
+    description = description or ""
+    sections: List[SOPSection] = []
+    for sec in template["sections"]:
+        content = sec.get("content", "")
+        # Static text needs no formatting; both braces are checked since "}}" still unescapes
+        if "{" in content or "}" in content:
+            content = content.format(metadata=metadata, description=description)
+        sections.append(SOPSection(title=sec.get("title", "Section"), content=content))
+    return sections
+
+
 def _rule_based_sections(metadata: Dict[str, Any], description: str | None, template: Dict[str, Any] | None) -> List[SOPSection]:
     """Return only project-specific sections derived from metadata.
 
@@ -322,40 +411,38 @@ def _rule_based_sections(metadata: Dict[str, Any], description: str | None, temp
     # 2) Tech Stack & Dependencies - list exact items we detected
     lines: List[str] = []
     if languages:
-        lines.append("Languages: " + ", ".join(sorted(languages)))
+        lines.append("Languages: " + _joined_sorted(tuple(languages)))
     if frameworks:
-        lines.append("Frameworks: " + ", ".join(sorted(frameworks)))
+        lines.append("Frameworks: " + _joined_sorted(tuple(frameworks)))
 
-    # Dependencies details
-    if deps.get("node"):
-        node = deps["node"]
+    # Dependencies details. Each entry is looked up once; the walrus keeps the original
+    # truthiness test, so an empty {} entry is still treated as absent.
+    node = deps.get("node")
+    node_scripts = node.get("scripts") if node else None
+    if node:
         lines.append("\nNode.js package.json:")
-        if node.get("name"):
-            lines.append(f"- name: {node['name']}")
-        if node.get("version"):
-            lines.append(f"- version: {node['version']}")
-        if node.get("dependencies"):
+        if name := node.get("name"):
+            lines.append(f"- name: {name}")
+        if version := node.get("version"):
+            lines.append(f"- version: {version}")
+        if node_deps := node.get("dependencies"):
             lines.append("- dependencies:")
-            for k, v in node["dependencies"].items():
-                lines.append(f"  - {k}: {v}")
-        if node.get("devDependencies"):
+            lines.extend(f"  - {k}: {v}" for k, v in node_deps.items())
+        if dev_deps := node.get("devDependencies"):
             lines.append("- devDependencies:")
-            for k, v in node["devDependencies"].items():
-                lines.append(f"  - {k}: {v}")
-        if node.get("scripts"):
+            lines.extend(f"  - {k}: {v}" for k, v in dev_deps.items())
+        if node_scripts:
             lines.append("- scripts:")
-            for s, cmd in node["scripts"].items():
-                lines.append(f"  - {s}: {cmd}")
+            lines.extend(f"  - {s}: {cmd}" for s, cmd in node_scripts.items())
 
-    if deps.get("python"):
-        py = deps["python"]
+    if py := deps.get("python"):
         reqs = py.get("requirements", [])
         if reqs:
             lines.append("\nPython requirements:")
-            for r in reqs:
-                lines.append(f"- {r}")
+            lines.extend(f"- {r}" for r in reqs)
 
-    if deps.get("java"):
+    has_java = deps.get("java")
+    if has_java:
         lines.append("\nJava/Maven: pom.xml detected")
 
     if deps.get("docker"):
@@ -370,8 +457,7 @@ def _rule_based_sections(metadata: Dict[str, Any], description: str | None, temp
     api_lines: List[str] = []
     for kind, items in routes.items():
         api_lines.append(f"{kind.title()} endpoints:")
-        for it in items:
-            api_lines.append(f"- {it['method']} {it['path']} ({it['file']})")
+        api_lines.extend(f"- {it['method']} {it['path']} ({it['file']})" for it in items)
     api_routes = SOPSection(
         title="API Routes",
         content=("\n".join(api_lines) if api_lines else "No routes detected.")
@@ -379,19 +465,17 @@ def _rule_based_sections(metadata: Dict[str, Any], description: str | None, temp
 
     # 4) Commands & Run Instructions - infer from scripts or stack
     cmd_lines: List[str] = []
-    if deps.get("node") and deps["node"].get("scripts"):
+    if node_scripts:
         cmd_lines.append("Node.js commands:")
-        scripts = deps["node"]["scripts"]
-        for s, cmd in scripts.items():
-            cmd_lines.append(f"- {s}: {cmd}")
-    if "Java" in languages or deps.get("java"):
-        cmd_lines.append("Maven commands:")
-        cmd_lines.append("- build: mvn clean package")
-        cmd_lines.append("- run: mvn spring-boot:run")
-    if "Python" in languages or deps.get("python"):
-        cmd_lines.append("Python commands:")
-        cmd_lines.append("- install: pip install -r requirements.txt")
-        cmd_lines.append("- run: uvicorn app.main:app --reload (adjust to your entry) ")
+        cmd_lines.extend(f"- {s}: {cmd}" for s, cmd in node_scripts.items())
+    if "Java" in languages or has_java:
+        cmd_lines.extend(("Maven commands:", "- build: mvn clean package", "- run: mvn spring-boot:run"))
+    if "Python" in languages or py:
+        cmd_lines.extend((
+            "Python commands:",
+            "- install: pip install -r requirements.txt",
+            "- run: uvicorn app.main:app --reload (adjust to your entry) ",
+        ))
     commands = SOPSection(
         title="Project Commands",
         content=("\n".join(cmd_lines) if cmd_lines else "No commands inferred.")
@@ -399,7 +483,7 @@ def _rule_based_sections(metadata: Dict[str, Any], description: str | None, temp
 
     # 5) Environment & Config
     env_lines: List[str] = []
-    if deps.get("env") and deps["env"].get("example"):
+    if (env := deps.get("env")) and env.get("example"):
         env_lines.append(".env.example content detected")
     environment = SOPSection(
         title="Environment & Config",
@@ -410,80 +494,121 @@ def _rule_based_sections(metadata: Dict[str, Any], description: str | None, temp
 
     # If a custom template is provided, honor it and return only those sections
     if template and isinstance(template, dict) and template.get("sections"):
-        templ_sections: List[SOPSection] = []
-        for sec in template["sections"]:
-            title = sec.get("title", "Section")
-            content = sec.get("content", "").format(metadata=metadata, description=description or "")
-            templ_sections.append(SOPSection(title=title, content=content))
-        return templ_sections
+        return _render_template_sections(template, metadata, description)
 
     return base_sections
 
 
+def _sop_cache_key(project_id: str, project_name: str, metadata: Dict[str, Any], description: str | None, template: Dict[str, Any] | None, sop_style: str | None, backend: str) -> Optional[bytes]:
+    """Content hash of everything that shapes a generated SOP, or None if unhashable.
+
+    Keys are hashed in insertion order: sections list dependencies, scripts and routes
+    in dict order, so the same metadata in a different order is a different SOP.
+    """
+    model = settings.HF_MODEL_NAME if backend == "hf" else settings.GPT4ALL_MODEL_PATH if backend == "gpt4all" else None
+    try:
+        raw = orjson.dumps(
+            [project_id, project_name, metadata, description, template, sop_style, backend, model],
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+    except TypeError:
+        return None
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
 def generate_sop_document(project_id: str, project_name: str, metadata: Dict[str, Any], project_description: str | None, template: Dict[str, Any] | None, sop_style: str | None = None) -> SOPDocument:
     backend = _detect_backend()
-    
-    # If custom template provided, use it
-    if template and isinstance(template, dict) and template.get("sections"):
-        templ_sections: List[SOPSection] = []
-        for sec in template["sections"]:
-            title = sec.get("title", "Section")
-            content = sec.get("content", "").format(metadata=metadata, description=project_description or "")
-            templ_sections.append(SOPSection(title=title, content=content))
-        sections = templ_sections
-    else:
-        # HYBRID APPROACH: Use rule-based as base (project-specific), enhance with AI
-        sections = _rule_based_sections(metadata, project_description, None)
-        
-        # Try to enhance with AI
-        print(f"Backend detected: {backend}")
-        if backend in ("hf", "gpt4all"):
-            print("Attempting AI enhancement...")
-            ai_enhancement = _ai_enhance_sections(project_name, metadata, project_description, backend, sop_style)
-            print(f"AI enhancement result: {ai_enhancement is not None}")
-            if ai_enhancement:
-                # Add AI enhancement as a new section
-                # Insert insights after API Routes if present
-                insertion_index = 3 if len(sections) >= 3 else len(sections)
-                sections.insert(insertion_index, SOPSection(title="Project Insights", content=ai_enhancement))
-                print("Added AI enhancement to SOP")
-            else:
-                print("AI enhancement failed or returned None")
-        else:
-            print(f"Backend {backend} not supported for AI enhancement")
 
-    sop_id = str(uuid.uuid4())
-    metadata = dict(metadata)
-    metadata["generation_backend"] = backend
-    metadata["hf_model_name"] = settings.HF_MODEL_NAME if backend == "hf" else metadata.get("hf_model_name")
-    sop = SOPDocument(id=sop_id, project_name=project_name or project_id, sections=sections, metadata=metadata)
+    # Regenerating an unchanged project (e.g. a UI refresh) reuses the cached sections and
+    # metadata; every call still gets a fresh id so it is saved as its own SOP.
+    key = _sop_cache_key(project_id, project_name, metadata, project_description, template, sop_style, backend)
+    cached = _sop_cache_get(key) if key is not None else None
+    if cached is None:
+        sections, cacheable = _build_sop_sections(project_name, metadata, project_description, template, sop_style, backend)
+        # One merge instead of a copy plus per-key writes. Still a shallow copy: nested
+        # routes/dependencies are shared with the caller's dict, so don't mutate them here.
+        sop_metadata = {
+            **metadata,
+            "generation_backend": backend,
+            "hf_model_name": settings.HF_MODEL_NAME if backend == "hf" else metadata.get("hf_model_name"),
+        }
+        cached = (tuple(sections), sop_metadata)
+        if key is not None and cacheable:
+            _sop_cache_put(key, cached)
+
+    sections, sop_metadata = cached
+    # Built entirely from server-side data, so skip Pydantic validation. Sections are frozen
+    # dataclasses, so only the containers need copying to keep the cached entry private.
+    sop = SOPDocument.model_construct(id=new_id(), project_name=project_name or project_id, sections=list(sections), metadata=dict(sop_metadata))
     return sop
 
 
+def _has_enrichable_metadata(metadata: Dict[str, Any]) -> bool:
+    return bool(metadata.get("languages") or metadata.get("frameworks") or metadata.get("routes") or metadata.get("dependencies"))
+
+
+def _build_sop_sections(project_name: str, metadata: Dict[str, Any], project_description: str | None, template: Dict[str, Any] | None, sop_style: str | None, backend: str) -> Tuple[List[SOPSection], bool]:
+    """Return the SOP sections and whether they are safe to cache (no failed AI call)."""
+    # If custom template provided, use it
+    if template and isinstance(template, dict) and template.get("sections"):
+        return _render_template_sections(template, metadata, project_description), True
+
+    # HYBRID APPROACH: Use rule-based as base (project-specific), enhance with AI
+    sections = _rule_based_sections(metadata, project_description, None)
+
+    # Try to enhance with AI
+    logger.debug("Backend detected: %s", backend)
+    if backend not in ("hf", "gpt4all"):
+        logger.debug("Backend %s not supported for AI enhancement", backend)
+        return sections, True
+    if not _has_enrichable_metadata(metadata):
+        # The prompt would be all "Unknown"/"None detected"; not worth a model call
+        logger.debug("Skipping AI enhancement: no project metadata to enrich")
+        return sections, True
+
+    logger.debug("Attempting AI enhancement...")
+    ai_enhancement = _ai_enhance_sections(project_name, metadata, project_description, backend, sop_style)
+    logger.debug("AI enhancement result: %s", ai_enhancement is not None)
+    if not ai_enhancement:
+        # Not cached, so a transient backend failure is retried on the next request
+        logger.debug("AI enhancement failed or returned None")
+        return sections, False
+    # Add AI enhancement as a new section
+    # Insert insights after API Routes if present
+    insertion_index = 3 if len(sections) >= 3 else len(sections)
+    sections.insert(insertion_index, SOPSection(title="Project Insights", content=ai_enhancement))
+    logger.debug("Added AI enhancement to SOP")
+    return sections, True
+
+
 def _ai_enhance_sections(project_name: str, metadata: Dict[str, Any], description: str | None, backend: str, sop_style: str | None) -> str | None:
     """Generate AI enhancement for existing sections."""
     
-    # Build project context
-    languages = ", ".join(metadata.get("languages", [])) or "Unknown"
-    frameworks = ", ".join(metadata.get("frameworks", [])) or "Unknown"
+    # Build project context; sorted like the Tech Stack section, since parsing emits set order
+    languages = _joined_sorted(tuple(metadata.get("languages", []))) or "Unknown"
+    frameworks = _joined_sorted(tuple(metadata.get("frameworks", []))) or "Unknown"
     routes = metadata.get("routes", {})
     
     # Create focused prompt for enhancement
     style_hint = sop_style or _infer_style_from_metadata(metadata)
     
-    # Build detailed context
-    api_details = []
+    # Build detailed context straight into one buffer; each line is newline-terminated
+    buf = StringIO()
     for kind, items in routes.items():
         if items:
-            api_details.append(f"{kind.title()}: {len(items)} endpoints")
-            for item in items[:3]:  # Show first 3 endpoints as examples
-                api_details.append(f"  - {item['method']} {item['path']}")
+            buf.write(f"{kind.title()}: {len(items)} endpoints\n")
+            for item in islice(items, 3):  # Show first 3 endpoints as examples
+                buf.write(f"  - {item['method']} {item['path']}\n")
+    api_details = buf.getvalue()[:-1] or "No API routes detected"
     
     deps_info = []
-    if deps := metadata.get("dependencies", {}):
-        if node_deps := deps.get("node"):
+    # An entry that is present but empty (e.g. package.json without name/version) still
+    # signals that stack, so presence is tested with `is not None` rather than truthiness.
+    deps = metadata.get("dependencies") or {}
+    if deps:
+        if (node_deps := deps.get("node")) is not None:
             deps_info.append(f"Node.js: {node_deps.get('name', 'Unknown')} v{node_deps.get('version', 'Unknown')}")
-        if py_deps := deps.get("python"):
+        if (py_deps := deps.get("python")) is not None:
             deps_info.append(f"Python: {len(py_deps.get('requirements', []))} packages")
         if deps.get("java"):
             deps_info.append("Java/Maven project")
@@ -494,8 +619,8 @@ PROJECT: {project_name}
 DESCRIPTION: {description or "Software project"}
 TECH STACK: {languages}, {frameworks}
 DEPENDENCIES: {', '.join(deps_info) if deps_info else 'None detected'}
-API ENDPOINTS: {len(routes.get('spring', [])) + len(routes.get('express', [])) + len(routes.get('fastapi', [])) + len(routes.get('laravel', []))} total
-{chr(10).join(api_details) if api_details else 'No API routes detected'}
+API ENDPOINTS: {sum(len(routes.get(k) or ()) for k in _API_KINDS)} total
+{api_details}
 
 Provide specific recommendations for:
 1. Architecture patterns for this tech stack
@@ -518,7 +643,7 @@ Focus on actionable, project-specific advice rather than generic best practices.
 
 def _infer_style_from_metadata(metadata: Dict[str, Any]) -> str:
     routes = metadata.get("routes", {})
-    if any(routes.get(k) for k in ["spring", "express", "fastapi", "laravel"]):
+    if any(routes.get(k) for k in _API_KINDS):
         return "web API service"
     deps = metadata.get("dependencies", {})
     if deps.get("node") and deps["node"].get("scripts", {}).get("build"):
@@ -593,21 +718,8 @@ def _parse_ai_response_to_sections(ai_response: str, project_name: str, descript
     """Parse AI response into structured SOP sections."""
     sections = []
     
-    # Split by common section headers
-    section_patterns = [
-        r'#+\s*(Introduction|Overview)',
-        r'#+\s*(Tech Stack|Architecture|Technology)',
-        r'#+\s*(Setup|Installation|Getting Started)',
-        r'#+\s*(API|Endpoints|Documentation)',
-        r'#+\s*(Development|Workflow|Process)',
-        r'#+\s*(Testing|Tests)',
-        r'#+\s*(Deployment|Deploy|Production)',
-        r'#+\s*(Troubleshooting|Issues|Problems)',
-        r'#+\s*(Maintenance|Best Practices|Guidelines)'
-    ]
-    
     # If AI response doesn't have clear sections, create structured ones
-    if not any(re.search(pattern, ai_response, re.IGNORECASE) for pattern in section_patterns):
+    if not _SECTION_HEADER_RE.search(ai_response):
         # Split by double newlines and create sections
         parts = [p.strip() for p in ai_response.split('\n\n') if p.strip()]
         if parts:
@@ -627,7 +739,7 @@ def _parse_ai_response_to_sections(ai_response: str, project_name: str, descript
             ))
     else:
         # Parse structured response
-        lines = ai_response.split('\n')
+        lines = ai_response.splitlines()
         current_section = None
         current_content = []
         
@@ -637,9 +749,7 @@ def _parse_ai_response_to_sections(ai_response: str, project_name: str, descript
                 continue
                 
             # Check if this is a section header
-            is_header = any(re.search(pattern, line, re.IGNORECASE) for pattern in section_patterns)
-            
-            if is_header:
+            if _SECTION_HEADER_RE.search(line):
                 # Save previous section
                 if current_section and current_content:
                     sections.append(SOPSection(
@@ -648,7 +758,7 @@ def _parse_ai_response_to_sections(ai_response: str, project_name: str, descript
                     ))
                 
                 # Start new section
-                current_section = re.sub(r'^#+\s*', '', line).strip()
+                current_section = _STRIP_HASHES_RE.sub('', line).strip()
                 current_content = []
             else:
                 current_content.append(line)
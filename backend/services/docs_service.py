@@ -1,95 +1,164 @@
 import re
-import ast
+import hashlib
+import io
 import json
-from typing import Dict, Any, List, Optional
-import tempfile
-import os
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from xml.sax.saxutils import escape as xml_escape
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+import orjson
 
 
 _CURL_SPLIT_RE = re.compile(r"\n\s*\n+", re.MULTILINE)
+# A shell-ish token: bare text and quoted segments glued together; an unclosed quote runs to the end
+_SHELL_TOKEN_RE = re.compile(r"""(?:[^\s'"]+|"[^"]*"?|'[^']*'?)+""")
+_QUOTED_SEG_RE = re.compile(r""""([^"]*)"?|'([^']*)'?""")
+_BASE_URL_RE = re.compile(r"^(https?://[^/]+)")
+_SCHEME_HOST_RE = re.compile(r"^https?://[^/]+(.*)$")
+_OPID_RE = re.compile(r"[^a-zA-Z0-9]")
+_ID_SEG_RE = re.compile(r"[0-9a-fA-F-]{6,}")
+_VERSION_TRIM_RE = re.compile(r"\s+API$")
+_ESCAPED_JSON_CHAR_RE = re.compile(r'\\([{}\[\]"])')
+_WHITESPACE_RUN_RE = re.compile(r'\s+')
+# A markdown table separator cell (---, :--:, ...); cells are already stripped, so + implies non-empty
+_SEP_CELL_RE = re.compile(r"[-: ]+")
+_HTML_TAG_RE = re.compile(r'<.*?>')
+_HEADER_FLAGS = frozenset(("-H", "--header"))
+_DATA_FLAGS = frozenset(("-d", "--data", "--data-raw", "--data-binary"))
+_METHOD_FLAGS = frozenset(("-X", "--request"))
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI')
+# What the stdlib parser accepts but orjson rejects: NaN/Infinity, surrogate escapes or
+# raw surrogates, integers beyond 64 bits and float exponents that overflow
+_STDLIB_ONLY_JSON_RE = re.compile(r"NaN|Infinity|\\u[dD][89a-fA-F]|[\ud800-\udfff]|\d{20}|[eE][+-]?\d{3}")
+_URL_PREFIXES = ("http://", "https://", "/")
+_APIKEY_HEADERS = frozenset(("x-api-key", "api-key"))
+_SENSITIVE_HEADERS = _APIKEY_HEADERS | {"authorization"}
+
+# Static OpenAPI fragments shared by every generated operation. The built document is
+# read-only for callers (it is memoized), so the same objects are reused, not copied.
+_STRING_SCHEMA: Dict[str, Any] = {"type": "string"}
+_OK_RESPONSE: Dict[str, Any] = {
+    "description": "OK",
+    "content": {"application/json": {"schema": {"type": "object"}}}
+}
+_ID_PATH_PARAM: Dict[str, Any] = {
+    "in": "path",
+    "name": "id",
+    "required": True,
+    "schema": _STRING_SCHEMA
+}
+# Added to every operation that doesn't already declare the status
+_STD_ERROR_RESPONSES = tuple((code, {"description": desc}) for code, desc in (
+    ("400", "Bad Request"),
+    ("401", "Unauthorized"),
+    ("403", "Forbidden"),
+    ("404", "Not Found"),
+    ("429", "Too Many Requests"),
+    ("500", "Internal Server Error"),
+))
+
+# Memoized OpenAPI builds / markdown renders, keyed by a content digest of the inputs.
+# Users commonly export the same spec as PDF, DOCX and MD in a row.
+_MEMO_MAX = 128
+_memo_lock = threading.Lock()
+_openapi_memo: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_markdown_memo: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+# Request Body Fields markdown by (renderer, body shape); see _fields_block
+_fields_memo: "OrderedDict[Tuple[Any, Tuple[Any, ...]], str]" = OrderedDict()
+
+
+def _digest(obj: Any) -> Optional[bytes]:
+    """Content hash of a JSON-like object, or None if it can't be serialized.
+
+    Keys are hashed in insertion order on purpose: path and parameter order carry
+    through to the rendered output, so reordered inputs must not share a memo entry.
+    """
+    try:
+        raw = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return None
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _json_loads(txt: str) -> Any:
+    # Only text that could hold something orjson rejects is retried with the stdlib parser;
+    # anything else is plain invalid JSON and would fail there too
+    try:
+        return orjson.loads(txt)
+    except orjson.JSONDecodeError:
+        if _STDLIB_ONLY_JSON_RE.search(txt) is None:
+            raise
+    return json.loads(txt)
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    # The stdlib encoder still covers what orjson refuses (ints beyond 64 bits, non-str keys)
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    except TypeError:
+        return json.dumps(obj, indent=2)
+
+
+def _memo_get(memo: "OrderedDict[Any, Any]", key: Any) -> Any:
+    with _memo_lock:
+        value = memo.get(key)
+        if value is not None:
+            memo.move_to_end(key)
+        return value
+
+
+def _memo_put(memo: "OrderedDict[Any, Any]", key: Any, value: Any) -> None:
+    with _memo_lock:
+        memo[key] = value
+        memo.move_to_end(key)
+        if len(memo) > _MEMO_MAX:
+            memo.popitem(last=False)
 
 
 def _normalize_curls(curls_text: Optional[str], curls_list: Optional[List[str]]) -> List[str]:
     items: List[str] = []
     if curls_list:
-        items.extend([c for c in curls_list if isinstance(c, str) and c.strip()])
+        items.extend(c for c in curls_list if isinstance(c, str) and c.strip())
     if curls_text and curls_text.strip():
-        # split on blank lines if multiple curls in one text block
-        chunks = _CURL_SPLIT_RE.split(curls_text.strip())
-        for ch in chunks:
-            if ch.strip().startswith("curl "):
-                items.append(ch.strip())
-            else:
-                # Keep non-curl chunks for potential JSON fallback
-                items.append(ch.strip())
+        # split on blank lines if multiple curls in one text block; non-curl chunks
+        # are kept too, for the JSON fallback in parse_curls
+        items.extend(ch.strip() for ch in _CURL_SPLIT_RE.split(curls_text.strip()))
     # de-dup and keep order
-    seen = set()
-    unique: List[str] = []
-    for c in items:
-        if c not in seen:
-            unique.append(c)
-            seen.add(c)
-    return unique
-
-
-def _parse_headers(tokens: List[str]) -> Dict[str, str]:
-    headers: Dict[str, str] = {}
-    for i, tok in enumerate(tokens):
-        if tok in ("-H", "--header") and i + 1 < len(tokens):
-            raw = tokens[i + 1].strip().strip("'\"")
-            if ":" in raw:
-                k, v = raw.split(":", 1)
-                headers[k.strip()] = v.strip()
-    return headers
-
-
-def _parse_data(tokens: List[str]) -> Optional[str]:
-    for i, tok in enumerate(tokens):
-        if tok in ("-d", "--data", "--data-raw", "--data-binary") and i + 1 < len(tokens):
-            raw = tokens[i + 1].strip().strip("'\"")
-            # Attempt to unescape common shell escaping of JSON for better parsing later
-            try:
-                # Replace backslash-escaped quotes if present
-                cleaned = raw.encode('utf-8').decode('unicode_escape')
-            except Exception:
-                cleaned = raw
-            return cleaned
-    return None
+    return list(dict.fromkeys(items))
 
 
 def _coerce_json(value: str) -> Any:
     """Best-effort: turn variously escaped JSON-ish strings into Python objects.
 
-    Tries json.loads; if that fails, progressively normalizes common cURL/shell escaping patterns
+    Tries a plain JSON parse; if that fails, progressively normalizes common cURL/shell escaping patterns
     and tries again. Falls back to ast.literal_eval for edge cases.
     """
     if not isinstance(value, str):
         return value
+    return _coerce_json_str(value)
+
+
+# The same body/example strings are coerced by the OpenAPI build and again by each markdown
+# render. Cached results are shared, which is fine since callers only read them.
+@lru_cache(maxsize=1024)
+def _coerce_json_str(value: str) -> Any:
     txt = value.strip()
-    # Fast path
-    try:
-        return json.loads(txt)
-    except Exception:
-        pass
-    # Common normalizations
-    candidates = []
-    # 0) Extract JSON substring between first '{' and last '}' if present
-    if '{' in txt and '}' in txt:
-        start = txt.find('{')
-        end = txt.rfind('}') + 1
-        if end > start:
-            candidates.append(txt[start:end])
-    candidates.append(txt.replace('\\"', '"'))
-    candidates.append(re.sub(r"\\/", "/", txt))
-    candidates.append(re.sub(r"\\n", "", txt))
-    # Remove stray backslashes before quotes/braces
-    candidates.append(re.sub(r'\\([{}\[\]"])', r"\1", txt))
-    for cand in candidates:
+    # Fast path, only when txt can start a JSON value (NaN/Infinity included for the stdlib parser)
+    if txt and txt[0] in _JSON_START_CHARS:
+        try:
+            return _json_loads(txt)
+        except Exception:
+            pass
+    # Common normalizations, built lazily and tried in order
+    for cand in _coerce_candidates(txt):
         try:
-            return json.loads(cand)
+            return _json_loads(cand)
         except Exception:
             continue
-    # Try literal_eval for python-like dicts
+    # Try literal_eval for python-like dicts; ast is only needed on this rare path
+    import ast
     try:
         obj = ast.literal_eval(txt)
         return obj
@@ -97,70 +166,113 @@ def _coerce_json(value: str) -> Any:
         return value
 
 
-def _parse_method(tokens: List[str]) -> Optional[str]:
-    for i, tok in enumerate(tokens):
-        if tok in ("-X", "--request") and i + 1 < len(tokens):
-            return tokens[i + 1].strip().upper()
-    return None
+def _coerce_candidates(txt: str) -> Iterator[str]:
+    # Each candidate applies one normalization. One that would leave txt unchanged is
+    # skipped, since txt itself already failed to parse.
+    # 0) Extract JSON substring between first '{' and last '}' if present
+    if '{' in txt and '}' in txt:
+        start = txt.find('{')
+        end = txt.rfind('}') + 1
+        if end > start:
+            yield txt[start:end]
+    if '\\' not in txt:
+        return
+    if '\\"' in txt:
+        yield txt.replace('\\"', '"')
+    if "\\/" in txt:
+        yield txt.replace("\\/", "/")
+    if "\\n" in txt:
+        yield txt.replace("\\n", "")
+    # Remove stray backslashes before quotes/braces
+    cand = _ESCAPED_JSON_CHAR_RE.sub(r"\1", txt)
+    if cand != txt:
+        yield cand
 
 
-def _parse_url(tokens: List[str]) -> Optional[str]:
-    # URL is usually the last non-flag token or after --url
-    url: Optional[str] = None
-    for i, tok in enumerate(tokens):
-        if tok == "--url" and i + 1 < len(tokens):
-            url = tokens[i + 1]
-    if not url:
-        # pick last token that looks like a URL
-        for tok in reversed(tokens):
-            if tok.startswith("http://") or tok.startswith("https://") or tok.startswith("/"):
-                url = tok
-                break
-    if url:
-        return url.strip().strip("'\"")
-    return None
+def _unquote_segment(m: "re.Match[str]") -> str:
+    inner = m.group(1)
+    return inner if inner is not None else m.group(2)
 
 
 def _shell_split(s: str) -> List[str]:
-    # lightweight splitter respecting single/double quotes
+    # lightweight splitter respecting single/double quotes (no backslash escapes);
+    # tokens come from one regex scan, quotes are only stripped where present
     parts: List[str] = []
-    buf: List[str] = []
-    quote: Optional[str] = None
-    i = 0
-    while i < len(s):
-        ch = s[i]
-        if quote:
-            if ch == quote:
-                quote = None
-            else:
-                buf.append(ch)
-        else:
-            if ch in ("'", '"'):
-                quote = ch
-            elif ch.isspace():
-                if buf:
-                    parts.append(''.join(buf))
-                    buf = []
+    for m in _SHELL_TOKEN_RE.finditer(s):
+        tok = m.group()
+        if '"' in tok or "'" in tok:
+            q = tok[0]
+            # Common case: one fully quoted argument, e.g. -H 'Accept: */*' -> plain slice
+            if (q == '"' or q == "'") and len(tok) > 1 and tok[-1] == q and tok.count(q) == 2:
+                tok = tok[1:-1]
             else:
-                buf.append(ch)
-        i += 1
-    if buf:
-        parts.append(''.join(buf))
+                tok = _QUOTED_SEG_RE.sub(_unquote_segment, tok)
+            if not tok:
+                continue
+        parts.append(tok)
     return parts
 
 
-def parse_curl(curl_cmd: str) -> Dict[str, Any]:
-    tokens = _shell_split(curl_cmd.strip().lstrip("curl "))
-    body_peek = _parse_data(tokens)
-    method = _parse_method(tokens) or ("POST" if body_peek is not None else "GET")
-    url = _parse_url(tokens) or "/"
-    headers = _parse_headers(tokens)
-    data = body_peek
-    return {"method": method, "url": url, "headers": headers, "body": data}
+def _unescape_data(raw: str) -> str:
+    raw = raw.strip().strip("'\"")
+    # Attempt to unescape common shell escaping of JSON for better parsing later
+    try:
+        # Replace backslash-escaped quotes if present
+        return raw.encode('utf-8').decode('unicode_escape')
+    except Exception:
+        return raw
 
 
-def parse_curl_inputs(payload: Any) -> Dict[str, Any]:
-    curls = _normalize_curls(getattr(payload, "curls_text", None), getattr(payload, "curls", None))
+def _parse_tokens(tokens: List[str]) -> Tuple[Optional[str], Optional[str], Dict[str, str], Optional[str]]:
+    """Extract (method, url, headers, data) from cURL tokens in a single pass.
+
+    A flag's value is read by looking ahead rather than consuming it, so every token is still
+    inspected as a possible flag. The first -X and -d win, the last --url wins, and without
+    --url the URL is the last token that looks like one.
+    """
+    method: Optional[str] = None
+    data: Optional[str] = None
+    url_flag: Optional[str] = None
+    url_like: Optional[str] = None
+    headers: Dict[str, str] = {}
+    last = len(tokens) - 1
+    for i, tok in enumerate(tokens):
+        if tok.startswith(_URL_PREFIXES):
+            url_like = tok
+        if i == last:
+            break
+        if tok in _HEADER_FLAGS:
+            raw = tokens[i + 1].strip().strip("'\"")
+            if ":" in raw:
+                k, v = raw.split(":", 1)
+                headers[k.strip()] = v.strip()
+        elif tok in _DATA_FLAGS:
+            if data is None:
+                data = _unescape_data(tokens[i + 1])
+        elif tok in _METHOD_FLAGS:
+            if method is None:
+                method = tokens[i + 1].strip().upper()
+        elif tok == "--url":
+            url_flag = tokens[i + 1]
+    url = url_flag or url_like
+    if url:
+        url = url.strip().strip("'\"")
+    return method, url, headers, data
+
+
+def parse_curl(curl_cmd: str) -> Dict[str, Any]:
+    # Slice the command name off; lstrip("curl ") would also eat a leading c/u/r/l of the URL
+    s = curl_cmd.strip()
+    if s[:5].lower() == "curl ":
+        s = s[5:].lstrip()
+    tokens = _shell_split(s)
+    method, url, headers, data = _parse_tokens(tokens)
+    method = method or ("POST" if data is not None else "GET")
+    return {"method": method, "url": url or "/", "headers": headers, "body": data}
+
+
+def parse_curls(curls_text: Optional[str], curls_list: Optional[List[str]]) -> Dict[str, Any]:
+    curls = _normalize_curls(curls_text, curls_list)
     requests: List[Dict[str, Any]] = []
     leftovers: List[str] = []
     for c in curls:
@@ -171,28 +283,38 @@ def parse_curl_inputs(payload: Any) -> Dict[str, Any]:
     # Fallback: if there are no valid curl requests but the text looks like JSON, create a default POST
     if not requests and leftovers:
         combined = "\n".join(leftovers).strip()
-        # Try to find a JSON object or array
-        json_str = combined
-        try:
-            parsed_json = json.loads(json_str)
-            requests.append({
-                "method": "POST",
-                "url": "/",
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps(parsed_json)
-            })
-        except Exception:
-            # Ignore if not JSON
-            pass
+        # Try to find a JSON object or array; pasted prose is skipped without a parse attempt
+        if combined[:1] in ("{", "["):
+            try:
+                parsed_json = json.loads(combined)
+                requests.append({
+                    "method": "POST",
+                    "url": "/",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": json.dumps(parsed_json)
+                })
+            except Exception:
+                # Ignore if not JSON
+                pass
     return {"requests": requests}
 
 
+def parse_curl_inputs(payload: Any) -> Dict[str, Any]:
+    """Parse cURL input from any object exposing `curls_text` / `curls` attributes."""
+    return parse_curls(getattr(payload, "curls_text", None), getattr(payload, "curls", None))
+
+
+def parse_curl_inputs_dict(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse cURL input from a raw request body dict."""
+    return parse_curls(payload.get("curls_text"), payload.get("curls"))
+
+
 def _infer_base_url(requests: List[Dict[str, Any]], hint: Optional[str]) -> Optional[str]:
     if hint:
         return hint.rstrip('/')
     for r in requests:
         url = r.get("url") or ""
-        m = re.match(r"^(https?://[^/]+)", url)
+        m = _BASE_URL_RE.match(url)
         if m:
             return m.group(1).rstrip('/')
     return None
@@ -202,27 +324,38 @@ def _path_from_url(url: str, base_url: Optional[str]) -> str:
     if base_url and url.startswith(base_url):
         return url[len(base_url):] or "/"
     # strip scheme+host if present
-    m = re.match(r"^https?://[^/]+(.*)$", url)
+    m = _SCHEME_HOST_RE.match(url)
     if m:
         return m.group(1) or "/"
     return url if url.startswith('/') else "/" + url
 
 
 def _mask_sensitive(headers: Dict[str, str]) -> Dict[str, str]:
-    masked: Dict[str, str] = {}
-    for k, v in headers.items():
-        if k.lower() in ("authorization", "x-api-key", "api-key"):
-            masked[k] = "***"
-        else:
-            masked[k] = v
-    return masked
+    return {k: ("***" if k.lower() in _SENSITIVE_HEADERS else v) for k, v in headers.items()}
 
 
 def build_openapi_from_requests(project_name: str, base_url_hint: Optional[str], requests_payload: List[Dict[str, Any]], ai_enabled: bool = True) -> Dict[str, Any]:
+    """Build an OpenAPI document from parsed cURL requests.
+
+    Results are memoized by input digest; the returned dict is shared and must not be mutated.
+    """
+    key = _digest([project_name, base_url_hint, requests_payload, ai_enabled])
+    if key is not None:
+        cached = _memo_get(_openapi_memo, key)
+        if cached is not None:
+            return cached
+    openapi = _build_openapi(project_name, base_url_hint, requests_payload, ai_enabled)
+    if key is not None:
+        _memo_put(_openapi_memo, key, openapi)
+    return openapi
+
+
+def _build_openapi(project_name: str, base_url_hint: Optional[str], requests_payload: List[Dict[str, Any]], ai_enabled: bool) -> Dict[str, Any]:
     base_url = _infer_base_url(requests_payload, base_url_hint)
     paths: Dict[str, Any] = {}
     uses_bearer = False
     uses_api_key = False
+    paths_setdefault = paths.setdefault
 
     for r in requests_payload:
         method = r.get("method", "GET").lower()
@@ -237,17 +370,14 @@ def build_openapi_from_requests(project_name: str, base_url_hint: Optional[str],
         if segs:
             tag = segs[0]
 
+        params: List[Dict[str, Any]] = []
+        params_append = params.append
         op: Dict[str, Any] = {
             "summary": f"{method.upper()} {path}",
-            "operationId": re.sub(r"[^a-zA-Z0-9]", "_", f"{method}_{path}").strip("_"),
+            "operationId": _OPID_RE.sub("_", f"{method}_{path}").strip("_"),
             "tags": [tag or "general"],
-            "parameters": [],
-            "responses": {
-                "200": {
-                    "description": "OK",
-                    "content": {"application/json": {"schema": {"type": "object"}}}
-                }
-            }
+            "parameters": params,
+            "responses": {"200": _OK_RESPONSE}
         }
 
         # query parameters
@@ -258,37 +388,35 @@ def build_openapi_from_requests(project_name: str, base_url_hint: Optional[str],
                 if not q:
                     continue
                 name = q.split("=", 1)[0]
-                op["parameters"].append({
+                params_append({
                     "in": "query",
                     "name": name,
-                    "schema": {"type": "string"}
+                    "schema": _STRING_SCHEMA
                 })
 
-        # path parameters heuristic
-        for seg in path.split('/'):
-            if re.fullmatch(r"[0-9a-fA-F-]{6,}", seg) or seg.isdigit():
-                # turn into templated path param
-                path = path.replace("/" + seg, "/{id}")
-                op["parameters"].append({
-                    "in": "path",
-                    "name": "id",
-                    "required": True,
-                    "schema": {"type": "string"}
-                })
+        # path parameters heuristic: template the first id-looking segment. Rebuilt from
+        # segments so only that segment changes (a substring replace also hit e.g. /1234 for 123)
+        segs = path.split('/')
+        for idx, seg in enumerate(segs):
+            if seg and (seg.isdigit() or _ID_SEG_RE.fullmatch(seg)):
+                segs[idx] = "{id}"
+                path = "/".join(segs)
+                params_append(_ID_PATH_PARAM)
                 break
 
         # headers
         for hk, hv in headers.items():
-            if hk.lower() == "authorization" and isinstance(hv, str) and hv.lower().startswith("bearer"):
+            kl = hk.lower()
+            if kl == "authorization" and isinstance(hv, str) and hv.lower().startswith("bearer"):
                 uses_bearer = True
                 continue
-            if hk.lower() in ("x-api-key", "api-key"):
+            if kl in _APIKEY_HEADERS:
                 uses_api_key = True
                 continue
-            op["parameters"].append({
+            params_append({
                 "in": "header",
                 "name": hk,
-                "schema": {"type": "string"},
+                "schema": _STRING_SCHEMA,
                 "example": hv
             })
 
@@ -303,7 +431,7 @@ def build_openapi_from_requests(project_name: str, base_url_hint: Optional[str],
                 schema = {"type": "object" if isinstance(coerced, dict) else "array"}
             else:
                 try:
-                    example = json.loads(body)
+                    example = _json_loads(body)
                     schema = {"type": "object"}
                 except Exception:
                     example = body
@@ -317,18 +445,12 @@ def build_openapi_from_requests(project_name: str, base_url_hint: Optional[str],
             }
 
         # Standard error responses if not already present
-        for code, desc in {
-            "400": "Bad Request",
-            "401": "Unauthorized",
-            "403": "Forbidden",
-            "404": "Not Found",
-            "429": "Too Many Requests",
-            "500": "Internal Server Error",
-        }.items():
-            if code not in op["responses"]:
-                op["responses"][code] = {"description": desc}
-
-        paths.setdefault(path, {})[method] = op
+        responses = op["responses"]
+        for code, resp in _STD_ERROR_RESPONSES:
+            if code not in responses:
+                responses[code] = resp
+
+        paths_setdefault(path, {})[method] = op
 
     components: Dict[str, Any] = {"schemas": {}}
     security: List[Dict[str, Any]] = []
@@ -378,239 +500,463 @@ def build_openapi_from_requests(project_name: str, base_url_hint: Optional[str],
     return openapi
 
 
+# Field-table helpers shared by the sheet and vendor renderers. The two styles keep their
+# own description wording, so each has its own domain map, rules and fallback.
+_SHEET_FIELD_DESC: Dict[str, str] = {
+        "company_id": "Company identifier.",
+        "user_id": "User identifier initiating the request.",
+        "module_id": "Module identifier.",
+        "user_role_id": "Role identifier for authorization decisions.",
+        "module_name": "Human-readable module name.",
+        "page_no": "Page number for pagination (1-based).",
+        "record_per_page": "Number of records per page.",
+        "force_active_status": "If '1', restrict results to active entities.",
+        "employee_ids": "List of employee identifiers to filter results.",
+        "url": "Client page/route where the request originated.",
+        "device_info": "Information about client device and environment.",
+        "device_type": "Type of device (Desktop/Mobile/Tablet).",
+        "is_mobile": "Flag indicating mobile device (0/1).",
+        "is_tablet": "Flag indicating tablet device (0/1).",
+        "is_desktop": "Flag indicating desktop device (0/1).",
+        "browser": "Client browser name.",
+        "os": "Operating system name.",
+        "os_version": "Operating system version.",
+        "user_agent": "Raw user-agent string.",
+        "ip_address": "Client IP address.",
+        "is_vendor": "Flag indicating vendor context (0/1).",
+}
+
+_VENDOR_FIELD_DESC: Dict[str, str] = {
+        "company_id": "ID of the company.",
+        "user_id": "User ID making the request.",
+        "user_role_id": "Role ID of the logged-in user.",
+        "page_no": "Page number for pagination.",
+        "record_per_page": "Number of records per page.",
+        "force_active_status": "Filter for active status (1 = active only).",
+        "employee_ids": "List of employee IDs to filter.",
+        "url": "Module/section reference URL.",
+        "is_vendor": "0 = employee, 1 = vendor.",
+        "module_name": "Name of the module accessing API.",
+        "module_id": "ID of the module.",
+        "pr_no": "Purchase Request numbers filter.",
+        "po_no": "Purchase Order numbers filter.",
+        "irn_no": "IRN numbers filter.",
+        "vendor_id": "Vendor identifiers filter.",
+        "vendor_invoice_no": "Vendor invoice number filter.",
+        "vendor_invoice_date": "Vendor invoice date filter (YYYY-MM-DD).",
+        "invoice_approved_by": "Approver user IDs filter.",
+        "invoice_approved_date": "Invoice approval date filter.",
+        "gross_invoice_amount": "Gross invoice amount filter.",
+        "tds_amount": "TDS amount filter.",
+        "advance_deducted": "Advance deducted amount filter.",
+        "net_payable_amount": "Net payable amount filter.",
+        "payment_requested_by": "Payment requesting user IDs filter.",
+        "payment_entry_no": "Payment entry number filter.",
+        "payment_entry_date": "Payment entry date filter.",
+        "payment_amount": "Payment amount filter.",
+        "remaining_payment_amount": "Remaining payment amount filter.",
+        "payment_mode": "Payment mode (e.g., NEFT/RTGS/Cheque).",
+        "instrument_no": "Instrument/cheque number.",
+        "company_bank": "Company bank name.",
+        "utr_no": "Bank UTR number.",
+        "from_amount_clearing_date": "Start date for amount clearing range.",
+        "to_amount_clearing_date": "End date for amount clearing range.",
+        "payment_approval_status": "Payment approval status filter.",
+        "payment_status": "Payment status filter.",
+        "grn_approval_no": "GRN approval number.",
+        "column_list": "Columns to include in the report output.",
+        "from_payment_date": "Start payment date range.",
+        "to_payment_date": "End payment date range.",
+        "search_query": "Free-text search query.",
+        "is_excel_download": "If '1', export as Excel instead of JSON.",
+        "invoice_payment_remarks": "Remarks filter for invoice payments.",
+        "request_server_time": "Client-side request time (for logging).",
+        "device_info": "Device/browser metadata.",
+        "device_type": "Type of device (Desktop, Mobile, etc.).",
+        "is_mobile": "1 = mobile, 0 = not mobile.",
+        "is_tablet": "1 = tablet, 0 = not tablet.",
+        "is_desktop": "1 = desktop, 0 = not desktop.",
+        "browser": "Browser name (e.g., Chrome).",
+        "os": "Operating system (e.g., Windows/Mac).",
+        "os_version": "OS version (e.g., windows-10).",
+        "user_agent": "Full user agent string.",
+        "ip_address": "Client IP address (if available).",
+}
+
+
+# Field-table type labels by exact type; bool needs no special-casing ahead of int this way
+_TYPE_NAMES: Dict[type, str] = {
+    type(None): "String",
+    bool: "Boolean",
+    int: "Number",
+    float: "Number",
+    str: "String",
+    dict: "Object",
+}
+
+
+def _infer_type(value: Any) -> str:
+    if type(value) is list:
+        inner = _infer_type(value[0]) if value else "Any"
+        return f"Array<{inner}>"
+    return _TYPE_NAMES.get(type(value), "String")
+
+
+# Substring rules tried in order after the domain map; every marker of a rule must occur in
+# the lowercased key. _ID_FIELD stands for "the key is id or ends in _id".
+_ID_FIELD = object()
+_SHEET_DESC_RULES: Tuple[Tuple[Tuple[Any, ...], str], ...] = (
+    (("email",), "User email address."),
+    ((_ID_FIELD,), "Unique identifier."),
+    (("phone",), "Phone number."),
+    (("mobile",), "Phone number."),
+    (("name",), "Descriptive name."),
+    (("password",), "Secret credential; do not log."),
+    (("passcode",), "Secret credential; do not log."),
+    (("gst",), "GST identification number."),
+    (("pan",), "PAN number."),
+    (("account", "number"), "Bank account number (mask for security)."),
+    (("currency",), "Currency code (e.g., INR, USD)."),
+)
+_VENDOR_DESC_RULES: Tuple[Tuple[Tuple[Any, ...], str], ...] = (
+    (("email",), "Email address."),
+    ((_ID_FIELD,), "Unique identifier."),
+    (("phone",), "Phone number."),
+    (("mobile",), "Phone number."),
+    (("name",), "Descriptive name."),
+    (("password",), "Secret credential; never log."),
+    (("gst",), "GST identification number."),
+    (("pan",), "PAN number."),
+    (("account", "number"), "Bank account number (mask in logs)."),
+    (("currency",), "Currency code (e.g., INR, USD)."),
+)
+# style -> (domain map, rules, fallback template for keys nothing else describes)
+_FIELD_DESC_STYLES = {
+    "sheet": (_SHEET_FIELD_DESC, _SHEET_DESC_RULES, "Field '{}'."),
+    "vendor": (_VENDOR_FIELD_DESC, _VENDOR_DESC_RULES, ""),
+}
+
+
+@lru_cache(maxsize=4096)
+def _field_desc(key: str, kind: str, style: str) -> str:
+    """Describe a body field; `kind` is "list", "dict" or "" since only that affects the result.
+
+    Field names repeat across endpoints (device_info.* in every call), so results are cached.
+    """
+    domain_map, rules, fallback = _FIELD_DESC_STYLES[style]
+    k = key.lower()
+    desc = domain_map.get(k)
+    if desc is not None:
+        return desc
+    for markers, desc in rules:
+        for m in markers:
+            if m is _ID_FIELD:
+                if not (k == "id" or k.endswith("_id")):
+                    break
+            elif m not in k:
+                break
+        else:
+            return desc
+    if kind == "list":
+        return "List of values."
+    if kind == "dict":
+        return "Nested object."
+    return fallback.format(key)
+
+
+def _value_kind(value: Any) -> str:
+    return "list" if isinstance(value, list) else "dict" if isinstance(value, dict) else ""
+
+
+def _infer_desc_sheet(key: str, value: Any) -> str:
+    return _field_desc(key, _value_kind(value), "sheet")
+
+
+def _infer_desc_vendor(key: str, value: Any) -> str:
+    return _field_desc(key, _value_kind(value), "vendor")
+
+
+def _schema_fingerprint(example: Any) -> Tuple[Any, ...]:
+    """Preorder encoding of everything field rows depend on: key order, nesting and leaf types.
+
+    Each dict contributes its key tuple and each list whether it is empty, which is enough to
+    make the encoding unambiguous; values themselves are left out.
+    """
+    out: List[Any] = []
+    stack = [example]
+    while stack:
+        obj = stack.pop()
+        t = type(obj)
+        if t is dict:
+            out.append(tuple(obj))
+            stack.extend(reversed(obj.values()))
+        elif t is list:
+            out.append(bool(obj))
+            if obj:
+                stack.append(obj[0])
+        else:
+            out.append(_infer_type(obj))
+    return tuple(out)
+
+
+def _fields_block(example: Any, render: Callable[[Any], str]) -> str:
+    """Markdown for a body example's field tables, cached by shape since endpoints often share
+    payloads. `render` is one of the _render_*_fields functions below."""
+    key = (render, _schema_fingerprint(example))
+    block = _memo_get(_fields_memo, key)
+    if block is None:
+        block = render(example)
+        _memo_put(_fields_memo, key, block)
+    return block
+
+
+# Body fields the vendor style marks as required
+_REQUIRED_KEYS = frozenset(("company_id", "user_id", "user_role_id"))
+
+
+def _flatten_fields(example: Any, infer_desc: Callable[[str, Any], str]) -> List[Tuple[str, str, str, bool]]:
+    """Flatten a JSON example into dotted (name, type, description, required) rows, depth-first.
+
+    Uses an explicit stack rather than recursion; children are pushed in reverse so rows come
+    out in document order. A list contributes its own row, then its first element as `name[]`.
+    Examples are parsed JSON, so exact type checks stand in for isinstance.
+    """
+    out: List[Tuple[str, str, str, bool]] = []
+    append = out.append
+    stack: List[Tuple[str, Any]] = [("", example)]
+    pop, push, stack_append = stack.pop, stack.extend, stack.append
+    while stack:
+        prefix, obj = pop()
+        t = type(obj)
+        if t is dict:
+            push((f"{prefix}.{k}" if prefix else k, v) for k, v in reversed(obj.items()))
+            continue
+        key = prefix.rpartition('.')[2]
+        append((prefix, _infer_type(obj), infer_desc(key, obj), key in _REQUIRED_KEYS))
+        if t is list and obj and type(obj[0]) in (dict, list):
+            stack_append((prefix + "[]", obj[0]))
+    return out
+
+
+def _render_sheet_fields(example: Any) -> str:
+    fields = _flatten_fields(example, _infer_desc_sheet)
+    if not fields:
+        return ""
+    row = "| `%s` | %s | %s |\n"
+    return "".join([
+        "\n### Request Body Fields\n",
+        "| Field | Type | Description |\n|---|---|---|\n",
+        *(row % (name, type_, desc or "") for name, type_, desc, _ in fields),
+    ])
+
+
+def _render_vendor_fields(example: Any) -> str:
+    fields = _flatten_fields(example, _infer_desc_vendor)
+    if not fields:
+        return ""
+    row = "| `%s` | %s | %s | %s |\n"
+    parts = [
+        "\n### Request Body Fields\n",
+        "| Field | Type | Required | Description |\n|---|---|---|---|\n",
+    ]
+    parts.extend(
+        row % (name, type_, "Yes" if required else "No", desc)
+        for name, type_, desc, required in fields
+    )
+    # Nested device_info table if present
+    if isinstance(example, dict) and isinstance(example.get('device_info'), dict):
+        parts.append("\n#### device_info object\n")
+        parts.append("| Field | Type | Description |\n|---|---|---|\n")
+        dev_row = "| `%s` | %s | %s |\n"
+        parts.extend(dev_row % (k, _infer_type(v), _infer_desc_vendor(k, v)) for k, v in example['device_info'].items())
+    return "".join(parts)
+
+
+def _split_params(params: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Partition OpenAPI parameters into (header, query, path) lists in a single pass."""
+    headers: List[Dict[str, Any]] = []
+    query: List[Dict[str, Any]] = []
+    path_params: List[Dict[str, Any]] = []
+    for p in params:
+        loc = p.get("in")
+        if loc == "header":
+            headers.append(p)
+        elif loc == "query":
+            query.append(p)
+        elif loc == "path":
+            path_params.append(p)
+    return headers, query, path_params
+
+
+def _security_flags(sec: List[Dict[str, Any]]) -> Tuple[bool, bool]:
+    """Return (uses bearer, uses API key) from an OpenAPI security list in a single pass."""
+    has_bearer = has_api_key = False
+    for s in sec:
+        has_bearer = has_bearer or "bearerAuth" in s
+        has_api_key = has_api_key or "apiKeyAuth" in s
+    return has_bearer, has_api_key
+
+
+def _json_body_content(op: Dict[str, Any]) -> Dict[str, Any]:
+    return (op.get("requestBody") or {}).get("content", {}).get("application/json", {})
+
+
+def _pretty_json(example: Any, cache: Dict[int, Tuple[Any, str]]) -> str:
+    """Indented JSON for a body example, memoized per render by object identity.
+
+    Examples coerced from identical strings come back as the same object, so repeated
+    payloads across endpoints are serialized once. The cache holds the example itself
+    to keep its id from being reused while the render is running.
+    """
+    if isinstance(example, str):
+        return example
+    hit = cache.get(id(example))
+    if hit is None:
+        hit = cache[id(example)] = (example, _json_dumps_pretty(example))
+    return hit[1]
+
+
 def _render_sheet_style(openapi: Dict[str, Any]) -> str:
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
+    pretty_cache: Dict[int, Tuple[Any, str]] = {}
     info = openapi.get("info", {})
     title = info.get("title", "API")
     base = openapi.get("servers", [{}])
     base_url = base[0].get("url") if base else None
-    lines.append(f"# {title}")
-    lines.append("")
+    w(f"# {title}\n")
+    w("\n")
     if base_url:
-        lines.append(f"**Base URL**: `{base_url}`")
+        w(f"**Base URL**: `{base_url}`\n")
     # Authentication overview
     sec = openapi.get("security") or []
     if sec:
-        lines.append("")
-        lines.append("**Authentication**:")
-        if any("bearerAuth" in s for s in sec):
-            lines.append("- Bearer token (JWT) via `Authorization: Bearer <token>` header")
-        if any("apiKeyAuth" in s for s in sec):
-            lines.append("- API Key via `X-API-Key: <key>` header")
-    lines.append("")
-    lines.append("> This document is generated automatically from provided cURL requests.")
-    lines.append("")
+        w("\n")
+        w("**Authentication**:\n")
+        has_bearer, has_api_key = _security_flags(sec)
+        if has_bearer:
+            w("- Bearer token (JWT) via `Authorization: Bearer <token>` header\n")
+        if has_api_key:
+            w("- API Key via `X-API-Key: <key>` header\n")
+    w("\n")
+    w("> This document is generated automatically from provided cURL requests.\n")
+    w("\n")
     for path, ops in openapi.get("paths", {}).items():
         for method, op in ops.items():
-            lines.append(f"## {op.get('summary') or method.upper() + ' ' + path}")
-            lines.append("")
-            lines.append(f"- Method: **{method.upper()}**")
-            lines.append(f"- URL: `{path}`")
+            w(f"## {op.get('summary') or method.upper() + ' ' + path}\n")
+            w("\n")
+            w(f"- Method: **{method.upper()}**\n")
+            w(f"- URL: `{path}`\n")
             if op.get("tags"):
-                lines.append(f"- Tags: {', '.join(op['tags'])}")
+                w(f"- Tags: {', '.join(op['tags'])}\n")
             if op.get("parameters"):
-                headers = [p for p in op["parameters"] if p.get("in") == "header"]
-                query = [p for p in op["parameters"] if p.get("in") == "query"]
-                path_params = [p for p in op["parameters"] if p.get("in") == "path"]
+                headers, query, path_params = _split_params(op["parameters"])
                 if headers:
-                    lines.append("\n### Headers")
-                    lines.append("| Name | Example |\n|---|---|")
+                    w("\n### Headers\n")
+                    w("| Name | Example |\n|---|---|\n")
                     for h in headers:
-                        lines.append(f"| {h.get('name')} | {str(h.get('example') or '')} |")
+                        w(f"| {h.get('name')} | {str(h.get('example') or '')} |\n")
                 if path_params:
-                    lines.append("\n### Path Params")
-                    lines.append("| Name | Required |\n|---|---|")
+                    w("\n### Path Params\n")
+                    w("| Name | Required |\n|---|---|\n")
                     for p in path_params:
-                        lines.append(f"| {p.get('name')} | { 'yes' if p.get('required') else 'no' } |")
+                        w(f"| {p.get('name')} | { 'yes' if p.get('required') else 'no' } |\n")
                 if query:
-                    lines.append("\n### Query Params")
-                    lines.append("| Name |\n|---|")
+                    w("\n### Query Params\n")
+                    w("| Name |\n|---|\n")
                     for q in query:
-                        lines.append(f"| {q.get('name')} |")
+                        w(f"| {q.get('name')} |\n")
             if op.get("requestBody"):
-                lines.append("\n### Request Body")
-                example = op["requestBody"].get("content", {}).get("application/json", {}).get("example")
+                w("\n### Request Body\n")
+                example = _json_body_content(op).get("example")
                 # If example is a string that looks like JSON, parse/normalize it first
                 if isinstance(example, str):
                     example = _coerce_json(example)
                 if example is not None:
-                    pretty = json.dumps(example, indent=2) if not isinstance(example, str) else example
-                    lines.append("""
-```json
-%s
-```
-""".strip() % pretty)
+                    pretty = _pretty_json(example, pretty_cache)
+                    w(f"```json\n{pretty}\n```\n")
                 # Field dictionary (professional payload description)
-                def _infer_type(value: Any) -> str:
-                    if value is None:
-                        return "String"
-                    if isinstance(value, bool):
-                        return "Boolean"
-                    if isinstance(value, int) or isinstance(value, float):
-                        return "Number"
-                    if isinstance(value, str):
-                        return "String"
-                    if isinstance(value, list):
-                        inner = _infer_type(value[0]) if value else "Any"
-                        return f"Array<{inner}>"
-                    if isinstance(value, dict):
-                        return "Object"
-                    return "String"
-
-                def _infer_desc(key: str, value: Any) -> str:
-                    k = key.lower()
-                    # Domain-specific heuristics
-                    domain_map = {
-                        "company_id": "Company identifier.",
-                        "user_id": "User identifier initiating the request.",
-                        "module_id": "Module identifier.",
-                        "user_role_id": "Role identifier for authorization decisions.",
-                        "module_name": "Human-readable module name.",
-                        "page_no": "Page number for pagination (1-based).",
-                        "record_per_page": "Number of records per page.",
-                        "force_active_status": "If '1', restrict results to active entities.",
-                        "employee_ids": "List of employee identifiers to filter results.",
-                        "url": "Client page/route where the request originated.",
-                        "device_info": "Information about client device and environment.",
-                        "device_type": "Type of device (Desktop/Mobile/Tablet).",
-                        "is_mobile": "Flag indicating mobile device (0/1).",
-                        "is_tablet": "Flag indicating tablet device (0/1).",
-                        "is_desktop": "Flag indicating desktop device (0/1).",
-                        "browser": "Client browser name.",
-                        "os": "Operating system name.",
-                        "os_version": "Operating system version.",
-                        "user_agent": "Raw user-agent string.",
-                        "ip_address": "Client IP address.",
-                        "is_vendor": "Flag indicating vendor context (0/1).",
-                    }
-                    if k in domain_map:
-                        return domain_map[k]
-                    if "email" in k:
-                        return "User email address."
-                    if k.endswith("_id") or k == "id":
-                        return "Unique identifier."
-                    if "phone" in k or "mobile" in k:
-                        return "Phone number."
-                    if "name" in k:
-                        return "Descriptive name."
-                    if "password" in k or "passcode" in k:
-                        return "Secret credential; do not log."
-                    if "gst" in k or "gstin" in k:
-                        return "GST identification number."
-                    if "pan" in k:
-                        return "PAN number."
-                    if "account" in k and "number" in k:
-                        return "Bank account number (mask for security)."
-                    if "currency" in k:
-                        return "Currency code (e.g., INR, USD)."
-                    if isinstance(value, list):
-                        return "List of values."
-                    if isinstance(value, dict):
-                        return "Nested object."
-                    # Fallback generic
-                    return f"Field '{key}'."
-
-                def _flatten(prefix: str, obj: Any, out: List[Dict[str, str]]):
-                    if isinstance(obj, dict):
-                        for k, v in obj.items():
-                            _flatten(f"{prefix}.{k}" if prefix else k, v, out)
-                    elif isinstance(obj, list):
-                        sample = obj[0] if obj else None
-                        t = _infer_type(obj)
-                        out.append({
-                            "name": prefix,
-                            "type": t,
-                            "description": _infer_desc(prefix.split('.')[-1], obj)
-                        })
-                        if isinstance(sample, (dict, list)):
-                            _flatten(prefix + "[]", sample, out)
-                    else:
-                        out.append({
-                            "name": prefix,
-                            "type": _infer_type(obj),
-                            "description": _infer_desc(prefix.split('.')[-1], obj)
-                        })
-
                 if isinstance(example, (dict, list)):
-                    fields: List[Dict[str, str]] = []
-                    _flatten("", example, fields)
-                    if fields:
-                        lines.append("\n### Request Body Fields")
-                        lines.append("| Field | Type | Description |\n|---|---|---|")
-                        for f in fields:
-                            desc = f.get("description") or ""
-                            lines.append(f"| `{f['name']}` | {f['type']} | {desc} |")
+                    w(_fields_block(example, _render_sheet_fields))
             # Examples
             # Build curl from info we have
             curl_parts = ["curl", "-X", method.upper()]
             full_url = (base_url or "") + path
             curl_parts.append(f"\"{full_url}\"")
-            lines.append("\n### Example cURL")
-            lines.append("""
-```bash
-%s
-```
-""".strip() % (" ".join(curl_parts)))
+            w("\n### Example cURL\n")
+            w(f"```bash\n{' '.join(curl_parts)}\n```\n")
             if op.get("responses"):
-                lines.append("\n### Responses")
-                lines.append("| Status | Description |\n|---|---|")
+                w("\n### Responses\n")
+                w("| Status | Description |\n|---|---|\n")
                 for code, resp in op["responses"].items():
-                    lines.append(f"| {code} | {resp.get('description','')} |")
-            lines.append("")
-    return "\n".join(lines).strip() + "\n"
+                    w(f"| {code} | {resp.get('description','')} |\n")
+            w("\n")
+    return buf.getvalue().strip() + "\n"
 
 
 def render_markdown_from_openapi(openapi: Dict[str, Any], style: str = "default") -> str:
+    digest = _digest(openapi)
+    if digest is None:
+        return _render_markdown(openapi, style)
+    key = (digest, style)
+    md = _memo_get(_markdown_memo, key)
+    if md is None:
+        md = _render_markdown(openapi, style)
+        _memo_put(_markdown_memo, key, md)
+    return md
+
+
+def _render_markdown(openapi: Dict[str, Any], style: str) -> str:
     if style == "sheet":
         return _render_sheet_style(openapi)
     if style == "vendor":
         return _render_vendor_style(openapi)
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
+    pretty_cache: Dict[int, Tuple[Any, str]] = {}
     info = openapi.get("info", {})
     title = info.get("title", "API")
-    lines.append(f"# {title}")
-    lines.append("")
+    w(f"# {title}\n")
+    w("\n")
     if openapi.get("servers"):
-        lines.append("Servers:")
+        w("Servers:\n")
         for s in openapi["servers"]:
-            lines.append(f"- {s.get('url')}")
-        lines.append("")
+            w(f"- {s.get('url')}\n")
+        w("\n")
 
     for path, ops in openapi.get("paths", {}).items():
-        lines.append(f"## {path}")
+        w(f"## {path}\n")
         for method, op in ops.items():
-            lines.append(f"### {method.upper()}")
+            w(f"### {method.upper()}\n")
             if op.get("summary"):
-                lines.append(op["summary"])
+                w(f"{op['summary']}\n")
             if op.get("parameters"):
-                lines.append("")
-                lines.append("Parameters:")
+                w("\n")
+                w("Parameters:\n")
                 for p in op["parameters"]:
                     loc = p.get("in")
                     name = p.get("name")
-                    lines.append(f"- {loc} `{name}`")
+                    w(f"- {loc} `{name}`\n")
             if op.get("requestBody"):
-                lines.append("")
-                lines.append("Request Body:")
-                example = op["requestBody"].get("content", {}).get("application/json", {}).get("example")
+                w("\n")
+                w("Request Body:\n")
+                example = _json_body_content(op).get("example")
                 if example is not None:
-                    pretty = json.dumps(example, indent=2) if not isinstance(example, str) else example
-                    lines.append("""
-```json
-%s
-```
-""".strip() % pretty)
-        lines.append("")
-    return "\n".join(lines).strip() + "\n"
+                    pretty = _pretty_json(example, pretty_cache)
+                    w(f"```json\n{pretty}\n```\n")
+        w("\n")
+    return buf.getvalue().strip() + "\n"
 
 
 def _render_vendor_style(openapi: Dict[str, Any]) -> str:
-    lines: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
+    pretty_cache: Dict[int, Tuple[Any, str]] = {}
     info = openapi.get("info", {})
     title = info.get("title", "API")
     # Avoid duplicated 'API' in the header (e.g., 'Generated API API')
     try:
-        display_title = re.sub(r"\s+API$", "", title)
+        display_title = _VERSION_TRIM_RE.sub("", title)
     except Exception:
         display_title = title
     version = info.get("version", "1.0")
@@ -618,29 +964,30 @@ def _render_vendor_style(openapi: Dict[str, Any]) -> str:
     base_url = base[0].get("url") if base else None
 
     # Header
-    lines.append(f"# API Documentation: {display_title}")
-    lines.append("")
-    lines.append(f"Version: `{version}`")
+    w(f"# API Documentation: {display_title}\n")
+    w("\n")
+    w(f"Version: `{version}`\n")
     if base_url:
-        lines.append(f"Base URL: `{base_url}`")
-    lines.append("")
+        w(f"Base URL: `{base_url}`\n")
+    w("\n")
 
     # Auth section
     sec = openapi.get("security") or []
     if sec:
-        lines.append("## Authentication")
-        if any("bearerAuth" in s for s in sec):
-            lines.append("- Bearer token via `Authorization: Bearer <token>` header")
-        if any("apiKeyAuth" in s for s in sec):
-            lines.append("- API Key via `X-API-Key: <key>` header")
-        lines.append("")
+        w("## Authentication\n")
+        has_bearer, has_api_key = _security_flags(sec)
+        if has_bearer:
+            w("- Bearer token via `Authorization: Bearer <token>` header\n")
+        if has_api_key:
+            w("- API Key via `X-API-Key: <key>` header\n")
+        w("\n")
 
     # Standards
-    lines.append("## Conventions")
-    lines.append("- Content-Type: application/json")
-    lines.append("- Date/time in ISO 8601, UTC")
-    lines.append("- Idempotency: GET safe; POST/PUT/PATCH/DELETE may change state")
-    lines.append("")
+    w("## Conventions\n")
+    w("- Content-Type: application/json\n")
+    w("- Date/time in ISO 8601, UTC\n")
+    w("- Idempotency: GET safe; POST/PUT/PATCH/DELETE may change state\n")
+    w("\n")
 
     # Paths
     # We intentionally avoid static descriptions; prefer AI/populated OpenAPI fields
@@ -649,393 +996,360 @@ def _render_vendor_style(openapi: Dict[str, Any]) -> str:
         for method, op in ops.items():
             # Title per endpoint
             if 'ajax_getempcostcenter' in path:
-                lines.append("## Get Employee Cost Center")
+                w("## Get Employee Cost Center\n")
             else:
-                lines.append(f"## {op.get('summary') or method.upper() + ' ' + path}")
-            lines.append("")
+                w(f"## {op.get('summary') or method.upper() + ' ' + path}\n")
+            w("\n")
             # Endpoint block
-            lines.append("### Endpoint")
-            lines.append(f"`{method.upper()} {path}`")
+            w("### Endpoint\n")
+            w(f"`{method.upper()} {path}`\n")
             if op.get("tags"):
-                lines.append(f"- Tags: {', '.join(op['tags'])}")
+                w(f"- Tags: {', '.join(op['tags'])}\n")
             # Description: use OpenAPI op.description if present; otherwise omit
             desc = (op.get("description") or "").strip()
-            lines.append("")
-            lines.append("### Description")
+            w("\n")
+            w("### Description\n")
             # Ensure description is a paragraph and left-aligned; fall back text if empty
             safe_desc = desc if desc else "(description not provided)"
-            lines.append(safe_desc)
+            w(f"{safe_desc}\n")
 
             # Parameters
-            params = op.get("parameters", [])
-            headers = [p for p in params if p.get("in") == "header"]
-            path_params = [p for p in params if p.get("in") == "path"]
-            query_params = [p for p in params if p.get("in") == "query"]
+            headers, query_params, path_params = _split_params(op.get("parameters", ()))
             if path_params:
-                lines.append("\n### Path Parameters")
-                lines.append("| Name | Required | Description |\n|---|---|---|")
+                w("\n### Path Parameters\n")
+                w("| Name | Required | Description |\n|---|---|---|\n")
                 for p in path_params:
-                    lines.append(f"| `{p.get('name')}` | {'Yes' if p.get('required') else 'No'} | |")
+                    w(f"| `{p.get('name')}` | {'Yes' if p.get('required') else 'No'} | |\n")
             if query_params:
-                lines.append("\n### Query Parameters")
-                lines.append("| Name | Type | Required | Description |\n|---|---|---|---|")
+                w("\n### Query Parameters\n")
+                w("| Name | Type | Required | Description |\n|---|---|---|---|\n")
                 for p in query_params:
                     typ = (p.get('schema') or {}).get('type', 'string')
-                    lines.append(f"| `{p.get('name')}` | {typ} | No | |")
+                    w(f"| `{p.get('name')}` | {typ} | No | |\n")
             # Headers: derive only from provided cURL/OpenAPI parameters
-            params = op.get("parameters", [])
-            headers = [p for p in params if p.get("in") == "header"]
             if headers:
-                lines.append("\n### Headers")
+                w("\n### Headers\n")
                 # Per request: remove Description column from headers table
-                lines.append("| Header | Type | Required |\n|---|---|---|")
+                w("| Header | Type | Required |\n|---|---|---|\n")
                 for h in headers:
                     nm = h.get('name')
                     req = 'Yes' if h.get('required') else 'No'
-                    lines.append(f"| {nm} | String | {req} |")
+                    w(f"| {nm} | String | {req} |\n")
 
             # Request body
             rb = op.get("requestBody")
             if rb:
-                lines.append("\n### Request Body")
-                example = rb.get("content", {}).get("application/json", {}).get("example")
+                w("\n### Request Body\n")
+                example = _json_body_content(op).get("example")
                 if isinstance(example, str):
                     example = _coerce_json(example)
                 if example is not None:
-                    pretty = json.dumps(example, indent=2) if not isinstance(example, str) else example
-                    lines.append("""
-```json
-%s
-```
-""".strip() % pretty)
+                    pretty = _pretty_json(example, pretty_cache)
+                    w(f"```json\n{pretty}\n```\n")
 
                 # Field table
-                def _infer_type(value: Any) -> str:
-                    if value is None:
-                        return "String"
-                    if isinstance(value, bool):
-                        return "Boolean"
-                    if isinstance(value, int) or isinstance(value, float):
-                        return "Number"
-                    if isinstance(value, str):
-                        return "String"
-                    if isinstance(value, list):
-                        inner = _infer_type(value[0]) if value else "Any"
-                        return f"Array<{inner}>"
-                    if isinstance(value, dict):
-                        return "Object"
-                    return "String"
-
-                def _infer_desc(key: str, value: Any) -> str:
-                    k = key.lower()
-                    # Extended, domain-aware descriptions
-                    domain_map = {
-                        "company_id": "ID of the company.",
-                        "user_id": "User ID making the request.",
-                        "user_role_id": "Role ID of the logged-in user.",
-                        "page_no": "Page number for pagination.",
-                        "record_per_page": "Number of records per page.",
-                        "force_active_status": "Filter for active status (1 = active only).",
-                        "employee_ids": "List of employee IDs to filter.",
-                        "url": "Module/section reference URL.",
-                        "is_vendor": "0 = employee, 1 = vendor.",
-                        "module_name": "Name of the module accessing API.",
-                        "module_id": "ID of the module.",
-                        "pr_no": "Purchase Request numbers filter.",
-                        "po_no": "Purchase Order numbers filter.",
-                        "irn_no": "IRN numbers filter.",
-                        "vendor_id": "Vendor identifiers filter.",
-                        "vendor_invoice_no": "Vendor invoice number filter.",
-                        "vendor_invoice_date": "Vendor invoice date filter (YYYY-MM-DD).",
-                        "invoice_approved_by": "Approver user IDs filter.",
-                        "invoice_approved_date": "Invoice approval date filter.",
-                        "gross_invoice_amount": "Gross invoice amount filter.",
-                        "tds_amount": "TDS amount filter.",
-                        "advance_deducted": "Advance deducted amount filter.",
-                        "net_payable_amount": "Net payable amount filter.",
-                        "payment_requested_by": "Payment requesting user IDs filter.",
-                        "payment_entry_no": "Payment entry number filter.",
-                        "payment_entry_date": "Payment entry date filter.",
-                        "payment_amount": "Payment amount filter.",
-                        "remaining_payment_amount": "Remaining payment amount filter.",
-                        "payment_mode": "Payment mode (e.g., NEFT/RTGS/Cheque).",
-                        "instrument_no": "Instrument/cheque number.",
-                        "company_bank": "Company bank name.",
-                        "utr_no": "Bank UTR number.",
-                        "from_amount_clearing_date": "Start date for amount clearing range.",
-                        "to_amount_clearing_date": "End date for amount clearing range.",
-                        "payment_approval_status": "Payment approval status filter.",
-                        "payment_status": "Payment status filter.",
-                        "grn_approval_no": "GRN approval number.",
-                        "column_list": "Columns to include in the report output.",
-                        "from_payment_date": "Start payment date range.",
-                        "to_payment_date": "End payment date range.",
-                        "search_query": "Free-text search query.",
-                        "is_excel_download": "If '1', export as Excel instead of JSON.",
-                        "invoice_payment_remarks": "Remarks filter for invoice payments.",
-                        "request_server_time": "Client-side request time (for logging).",
-                        "device_info": "Device/browser metadata.",
-                        "device_type": "Type of device (Desktop, Mobile, etc.).",
-                        "is_mobile": "1 = mobile, 0 = not mobile.",
-                        "is_tablet": "1 = tablet, 0 = not tablet.",
-                        "is_desktop": "1 = desktop, 0 = not desktop.",
-                        "browser": "Browser name (e.g., Chrome).",
-                        "os": "Operating system (e.g., Windows/Mac).",
-                        "os_version": "OS version (e.g., windows-10).",
-                        "user_agent": "Full user agent string.",
-                        "ip_address": "Client IP address (if available).",
-                    }
-                    if k in domain_map:
-                        return domain_map[k]
-                    if "email" in k:
-                        return "Email address."
-                    if k.endswith("_id") or k == "id":
-                        return "Unique identifier."
-                    if "phone" in k or "mobile" in k:
-                        return "Phone number."
-                    if "name" in k:
-                        return "Descriptive name."
-                    if "password" in k:
-                        return "Secret credential; never log."
-                    if "gst" in k:
-                        return "GST identification number."
-                    if "pan" in k:
-                        return "PAN number."
-                    if "account" in k and "number" in k:
-                        return "Bank account number (mask in logs)."
-                    if "currency" in k:
-                        return "Currency code (e.g., INR, USD)."
-                    if isinstance(value, list):
-                        return "List of values."
-                    if isinstance(value, dict):
-                        return "Nested object."
-                    return ""
-
-                def _flatten(prefix: str, obj: Any, out: List[Dict[str, str]]):
-                    if isinstance(obj, dict):
-                        for k, v in obj.items():
-                            _flatten(f"{prefix}.{k}" if prefix else k, v, out)
-                    elif isinstance(obj, list):
-                        sample = obj[0] if obj else None
-                        out.append({
-                            "name": prefix,
-                            "type": _infer_type(obj),
-                            "description": _infer_desc(prefix.split('.')[-1], obj)
-                        })
-                        if isinstance(sample, (dict, list)):
-                            _flatten(prefix + "[]", sample, out)
-                    else:
-                        out.append({
-                            "name": prefix,
-                            "type": _infer_type(obj),
-                            "description": _infer_desc(prefix.split('.')[-1], obj)
-                        })
-
                 if isinstance(example, (dict, list)):
-                    fields: List[Dict[str, str]] = []
-                    _flatten("", example, fields)
-                    if fields:
-                        lines.append("\n### Request Body Fields")
-                        lines.append("| Field | Type | Required | Description |\n|---|---|---|---|")
-                        required_keys = {"company_id","user_id","user_role_id"}
-                        for f in fields:
-                            req = "Yes" if f['name'].split('.')[-1] in required_keys else "No"
-                            lines.append(f"| `{f['name']}` | {f['type']} | {req} | {f.get('description','')} |")
-
-                        # Nested device_info table if present
-                        if isinstance(example, dict) and isinstance(example.get('device_info'), dict):
-                            dev = example['device_info']
-                            lines.append("\n#### device_info object")
-                            lines.append("| Field | Type | Description |\n|---|---|---|")
-                            for k, v in dev.items():
-                                lines.append(f"| `{k}` | {_infer_type(v)} | {_infer_desc(k, v)} |")
+                    w(_fields_block(example, _render_vendor_fields))
 
             # Responses
             if op.get("responses"):
-                lines.append("\n### Responses")
-                lines.append("| Status | Description |\n|---|---|")
+                w("\n### Responses\n")
+                w("| Status | Description |\n|---|---|\n")
                 for code, resp in (op.get("responses") or {}).items():
-                    lines.append(f"| {code} | {resp.get('description','')} |")
+                    w(f"| {code} | {resp.get('description','')} |\n")
 
             # We intentionally do not include a sample request block
-            lines.append("")
+            w("\n")
 
     # Support section
-    lines.append("## Support & SLA")
-    lines.append("- Response time targets: 99.9% uptime, <300ms P50 for core endpoints")
-    lines.append("- Contact: support@example.com")
-    lines.append("- Changelog: maintained by provider")
-    lines.append("")
+    w("## Support & SLA\n")
+    w("- Response time targets: 99.9% uptime, <300ms P50 for core endpoints\n")
+    w("- Contact: support@example.com\n")
+    w("- Changelog: maintained by provider\n")
+    w("\n")
 
-    return "\n".join(lines).strip() + "\n"
+    return buf.getvalue().strip() + "\n"
 
 
-def generate_pdf(markdown_text: str) -> str:
-    """Generate a professional-looking PDF from markdown using reportlab platypus.
+# Line kinds for the PDF markdown walker
+_MD_BLANK, _MD_FENCE, _MD_TABLE, _MD_H1, _MD_H2, _MD_H3, _MD_BULLET, _MD_TEXT = range(8)
+_BULLET_SEP = '<br/>• '
 
-    - Headings mapped to larger fonts
-    - Paragraph spacing
-    - Markdown tables rendered as bordered tables
-    - Code blocks rendered in monospaced boxes
+
+def _classify_md_lines(lines: List[str]) -> List[Tuple[int, str]]:
+    """(kind, stripped line) for every line, in one sweep, so each line is stripped once.
+
+    Precedence matches the PDF walker: fences and tables by their stripped text, headings
+    only when unindented, then bullets.
     """
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import Preformatted
+    out: List[Tuple[int, str]] = []
+    append = out.append
+    for line in lines:
+        text = line.strip()
+        if not text:
+            kind = _MD_BLANK
+        elif text.startswith('```'):
+            kind = _MD_FENCE
+        elif text[0] == '|':
+            kind = _MD_TABLE
+        elif line.startswith('# '):
+            kind = _MD_H1
+        elif line.startswith('## '):
+            kind = _MD_H2
+        elif line.startswith('### '):
+            kind = _MD_H3
+        elif text.startswith('- '):
+            kind = _MD_BULLET
+        else:
+            kind = _MD_TEXT
+        append((kind, text))
+    return out
 
-    fd, path = tempfile.mkstemp(suffix=".pdf")
-    os.close(fd)
 
-    doc = SimpleDocTemplate(path, pagesize=A4, leftMargin=36, rightMargin=36, topMargin=40, bottomMargin=40)
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name='H1', parent=styles['Heading1'], fontSize=24, leading=28, spaceAfter=14, textColor=colors.HexColor('#0f172a')))
-    styles.add(ParagraphStyle(name='H2', parent=styles['Heading2'], fontSize=18, leading=22, spaceAfter=12, textColor=colors.HexColor('#111827')))
-    styles.add(ParagraphStyle(name='H3', parent=styles['Heading3'], fontSize=14, leading=20, spaceAfter=10, textColor=colors.HexColor('#111827')))
-    styles.add(ParagraphStyle(name='Body', parent=styles['BodyText'], fontSize=12, leading=18, spaceAfter=8, textColor=colors.black))
-    # Use a unique style name to avoid conflicts with default styles
-    # Use light background and dark text to match request for black text
-    styles.add(ParagraphStyle(name='CodeBlock', fontName='Courier', fontSize=11, leading=16, backColor=colors.HexColor('#f3f4f6'), textColor=colors.black, leftIndent=8, rightIndent=8, spaceAfter=10, borderPadding=8))
+def _parse_markdown_to_ops(markdown_text: str) -> List[Tuple[str, Any]]:
+    """Group classified markdown lines into PDF block ops, without touching reportlab.
 
+    Ops are ("code", text), ("table", rows) or (paragraph style name, text).
+    """
     lines = markdown_text.split('\n')
-    elements: List[Any] = []
+    tokens = _classify_md_lines(lines)
+    n = len(tokens)
+    ops: List[Tuple[str, Any]] = []
+    append = ops.append
 
     i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not line.strip():
+    while i < n:
+        kind, text = tokens[i]
+        if kind == _MD_BLANK:
             i += 1
             continue
 
         # Code block ```
-        if line.strip().startswith('```'):
-            fence = line.strip()
-            code_lines: List[str] = []
+        if kind == _MD_FENCE:
             i += 1
-            while i < len(lines) and not lines[i].strip().startswith('```'):
-                code_lines.append(lines[i])
+            start = i
+            while i < n and tokens[i][0] != _MD_FENCE:
                 i += 1
+            # an empty fence pair produces no block
+            if i > start:
+                append(("code", '\n'.join(lines[start:i])))
             # skip closing fence
             i += 1
-            elements.append(Preformatted('\n'.join(code_lines), styles['CodeBlock']))
             continue
 
         # Table block (markdown table starts with |... and has a separator on next line)
-        if '|' in line and line.strip().startswith('|'):
+        if kind == _MD_TABLE:
             # collect contiguous table lines
-            tbl_lines = [line]
+            start = i
             i += 1
-            while i < len(lines) and lines[i].strip().startswith('|'):
-                tbl_lines.append(lines[i])
+            while i < n and tokens[i][0] == _MD_TABLE:
                 i += 1
             # Parse table
             rows = []
-            for tl in tbl_lines:
+            for _, tl in tokens[start:i]:
                 # remove leading/trailing |
-                row = [c.strip() for c in tl.strip().strip('|').split('|')]
+                row = [c.strip() for c in tl.strip('|').split('|')]
                 # skip separator rows of ---
-                if all(set(c) <= set('-: ') and c for c in row):
+                if all(_SEP_CELL_RE.fullmatch(c) for c in row):
                     continue
                 rows.append(row)
             if rows:
-                # Make table span full available width
-                num_cols = len(rows[0]) if rows else 1
-                # Build Paragraph-wrapped cells to allow multiline wrapping
-                header_style = ParagraphStyle(name='TblHead', parent=styles['Body'], fontName='Helvetica-Bold', textColor=colors.white)
-                cell_style = ParagraphStyle(name='TblCell', parent=styles['Body'], fontSize=11, leading=14)
-                wrapped_rows: List[List[Any]] = []
-                for ridx, r in enumerate(rows):
-                    new_row: List[Any] = []
-                    for c in r:
-                        txt = re.sub(r'\s+', ' ', c)
-                        if ridx == 0:
-                            new_row.append(Paragraph(txt, header_style))
-                        else:
-                            new_row.append(Paragraph(txt, cell_style))
-                    wrapped_rows.append(new_row)
-                # Prefer wider last column when header contains Description
-                header_texts = [str(x) for x in rows[0]]
-                clean_headers = [re.sub(r'<.*?>','',t).strip().lower() for t in header_texts]
-                if num_cols == 4 and clean_headers == ['field','type','required','description']:
-                    # Fix field/type columns wider so they don't shrink
-                    col_widths = [doc.width*0.28, doc.width*0.18, doc.width*0.12, doc.width*0.42]
-                elif any('description' in h.lower() for h in header_texts) and num_cols >= 4:
-                    col_widths = [doc.width*0.25, doc.width*0.18, doc.width*0.12] + [doc.width*0.45]
-                else:
-                    col_width = doc.width / max(1, num_cols)
-                    col_widths = [col_width]*num_cols
-                # Use repeatRows=1 for header; allow word wrapping
-                t = Table(wrapped_rows, colWidths=col_widths, hAlign='LEFT', repeatRows=1)
-                t.setStyle(TableStyle([
-                    ('FONT', (0,0), (-1,0), 'Helvetica-Bold', 12),
-                    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#1f2937')),
-                    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-                    ('FONT', (0,1), (-1,-1), 'Helvetica', 11),
-                    ('GRID', (0,0), (-1,-1), 0.6, colors.HexColor('#9ca3af')),
-                    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-                    ('VALIGN', (0,0), (-1,-1), 'TOP'),
-                    ('LEFTPADDING', (0,0), (-1,-1), 8),
-                    ('RIGHTPADDING', (0,0), (-1,-1), 8),
-                    ('TOPPADDING', (0,0), (-1,-1), 6),
-                    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-                    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor('#f3f4f6')]),
-                    ('WORDWRAP', (0,0), (-1,-1), True),
-                ]))
-                elements.append(t)
-                elements.append(Spacer(1, 12))
+                append(("table", rows))
             continue
 
         # Headings
-        if line.startswith('# '):
-            elements.append(Paragraph(line[2:].strip(), styles['H1']))
-        elif line.startswith('## '):
-            elements.append(Paragraph(line[3:].strip(), styles['H2']))
-        elif line.startswith('### '):
-            elements.append(Paragraph(line[4:].strip(), styles['H3']))
-        else:
-            # Bullet lists
-            if line.strip().startswith('- '):
-                # group list items
-                items = [line.strip()[2:]]
+        # Heading texts repeat per operation ("Request Body Fields", "Responses"), so intern them
+        if kind == _MD_H1:
+            append(("H1", sys.intern(text[2:].strip())))
+        elif kind == _MD_H2:
+            append(("H2", sys.intern(text[3:].strip())))
+        elif kind == _MD_H3:
+            append(("H3", sys.intern(text[4:].strip())))
+        # Bullet lists
+        elif kind == _MD_BULLET:
+            # group list items
+            start = i
+            i += 1
+            while i < n and tokens[i][0] == _MD_BULLET:
                 i += 1
-                while i < len(lines) and lines[i].strip().startswith('- '):
-                    items.append(lines[i].strip()[2:])
-                    i += 1
-                elements.append(Paragraph('• ' + '<br/>• '.join(items), styles['Body']))
-                continue
-            elements.append(Paragraph(line.strip(), styles['Body']))
+            append(("Body", '• ' + _BULLET_SEP.join(t[2:] for _, t in tokens[start:i])))
+            continue
+        else:
+            append(("Body", text))
         i += 1
+    return ops
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles() -> Dict[str, Any]:
+    """Paragraph styles for generate_pdf, built on first use (reportlab is imported lazily)
+    and shared by every call afterwards; styles are only read while building documents."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    base = getSampleStyleSheet()
+    body = ParagraphStyle(name='Body', parent=base['BodyText'], fontSize=12, leading=18, spaceAfter=8, textColor=colors.black)
+    return {
+        'H1': ParagraphStyle(name='H1', parent=base['Heading1'], fontSize=24, leading=28, spaceAfter=14, textColor=colors.HexColor('#0f172a')),
+        'H2': ParagraphStyle(name='H2', parent=base['Heading2'], fontSize=18, leading=22, spaceAfter=12, textColor=colors.HexColor('#111827')),
+        'H3': ParagraphStyle(name='H3', parent=base['Heading3'], fontSize=14, leading=20, spaceAfter=10, textColor=colors.HexColor('#111827')),
+        'Body': body,
+        # Light background and dark text to match request for black text
+        'CodeBlock': ParagraphStyle(name='CodeBlock', fontName='Courier', fontSize=11, leading=16, backColor=colors.HexColor('#f3f4f6'), textColor=colors.black, leftIndent=8, rightIndent=8, spaceAfter=10, borderPadding=8),
+        'TblHead': ParagraphStyle(name='TblHead', parent=body, fontName='Helvetica-Bold', textColor=colors.white),
+        'TblCell': ParagraphStyle(name='TblCell', parent=body, fontSize=11, leading=14),
+    }
+
+
+@lru_cache(maxsize=None)
+def _pdf_table_style() -> Any:
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        ('FONT', (0,0), (-1,0), 'Helvetica-Bold', 12),
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#1f2937')),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('FONT', (0,1), (-1,-1), 'Helvetica', 11),
+        ('GRID', (0,0), (-1,-1), 0.6, colors.HexColor('#9ca3af')),
+        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+        ('VALIGN', (0,0), (-1,-1), 'TOP'),
+        ('LEFTPADDING', (0,0), (-1,-1), 8),
+        ('RIGHTPADDING', (0,0), (-1,-1), 8),
+        ('TOPPADDING', (0,0), (-1,-1), 6),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor('#f3f4f6')]),
+        ('WORDWRAP', (0,0), (-1,-1), True),
+    ])
+
+
+def _ops_to_flowables(ops: List[Tuple[str, Any]], width: float) -> List[Any]:
+    """Turn block ops into reportlab flowables using the shared styles."""
+    from reportlab.platypus import Paragraph, Preformatted, Table, Spacer
+
+    styles = _pdf_styles()
+    header_style, cell_style = styles['TblHead'], styles['TblCell']
+    elements: List[Any] = []
+    append = elements.append
+    for op, payload in ops:
+        if op == "code":
+            append(Preformatted(payload, styles['CodeBlock']))
+        elif op != "table":
+            append(Paragraph(payload, styles[op]))
+        else:
+            rows = payload
+            # Make table span full available width
+            num_cols = len(rows[0])
+            # Build Paragraph-wrapped cells to allow multiline wrapping
+            ws_sub = _WHITESPACE_RUN_RE.sub
+            wrapped_rows: List[List[Any]] = [[Paragraph(ws_sub(' ', c), header_style) for c in rows[0]]]
+            wrapped_rows.extend([Paragraph(ws_sub(' ', c), cell_style) for c in r] for r in rows[1:])
+            # Prefer wider last column when header contains Description
+            header_texts = rows[0]
+            clean_headers = [_HTML_TAG_RE.sub('', t).strip().lower() for t in header_texts]
+            if num_cols == 4 and clean_headers == ['field','type','required','description']:
+                # Fix field/type columns wider so they don't shrink
+                col_widths = [width*0.28, width*0.18, width*0.12, width*0.42]
+            elif any('description' in h.lower() for h in header_texts) and num_cols >= 4:
+                col_widths = [width*0.25, width*0.18, width*0.12] + [width*0.45]
+            else:
+                col_width = width / max(1, num_cols)
+                col_widths = [col_width]*num_cols
+            # Use repeatRows=1 for header; allow word wrapping
+            t = Table(wrapped_rows, colWidths=col_widths, hAlign='LEFT', repeatRows=1)
+            t.setStyle(_pdf_table_style())
+            append(t)
+            append(Spacer(1, 12))
+    return elements
+
+
+@lru_cache(maxsize=1024)
+def _wrap_fallback_line(line: str, max_width: float) -> Tuple[str, ...]:
+    # Generated markdown repeats many lines (headers, table rules), so wraps are memoized
+    from reportlab.lib.utils import simpleSplit
+    return tuple(simpleSplit(line, 'Helvetica', 10, max_width))
+
+
+def generate_pdf(markdown_text: str) -> bytes:
+    """Generate a professional-looking PDF from markdown using reportlab platypus.
+
+    The document is built in memory and returned as bytes.
+
+    - Headings mapped to larger fonts
+    - Paragraph spacing
+    - Markdown tables rendered as bordered tables
+    - Code blocks rendered in monospaced boxes
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=36, rightMargin=36, topMargin=40, bottomMargin=40)
+    elements = _ops_to_flowables(_parse_markdown_to_ops(markdown_text), doc.width)
 
     try:
         doc.build(elements)
-        return path
+        return buf.getvalue()
     except Exception as e:
         # Fallback to basic PDF writer to avoid blocking downloads
         from reportlab.lib.pagesizes import letter
         from reportlab.pdfgen import canvas
-        from reportlab.lib.utils import simpleSplit
-        fd2, path2 = tempfile.mkstemp(suffix=".pdf")
-        os.close(fd2)
-        c = canvas.Canvas(path2, pagesize=letter)
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=letter)
         width, height = letter
         margin = 40
-        y = height - margin
+        top = height - margin
         max_width = width - margin * 2
+        # One text object per page: the font is set once and lines advance by the leading
+        tobj = c.beginText(margin, top)
+        tobj.setFont('Helvetica', 10, 14)
+        y = top
         for line in markdown_text.split('\n'):
-            wrapped = simpleSplit(line, 'Helvetica', 10, max_width)
-            for w in wrapped:
+            for w in _wrap_fallback_line(line, max_width):
                 if y < margin:
+                    c.drawText(tobj)
                     c.showPage()
-                    y = height - margin
-                c.setFont('Helvetica', 10)
-                c.drawString(margin, y, w)
+                    tobj = c.beginText(margin, top)
+                    tobj.setFont('Helvetica', 10, 14)
+                    y = top
+                tobj.textLine(w)
                 y -= 14
+        c.drawText(tobj)
         c.save()
-        return path2
+        return buf.getvalue()
+
+
+_DOCX_W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+_DOCX_RUN_BREAKS_RE = re.compile(r"(\t|\r\n|\n|\r)")
+
+
+def _docx_run_xml(text: str) -> str:
+    """Run children for text, as python-docx writes them: <w:t> pieces, <w:tab/> and <w:br/>."""
+    parts: List[str] = []
+    for piece in _DOCX_RUN_BREAKS_RE.split(text):
+        if not piece:
+            continue
+        if piece == "\t":
+            parts.append("<w:tab/>")
+        elif piece in ("\r\n", "\n", "\r"):
+            parts.append("<w:br/>")
+        else:
+            space = ' xml:space="preserve"' if piece != piece.strip() else ""
+            parts.append(f"<w:t{space}>{xml_escape(piece)}</w:t>")
+    return "".join(parts)
+
 
+def _docx_row_xml(cells: List[str], cols: int, width_twips: int, bold: bool) -> str:
+    """<w:tr> for one table row; cells past `cols` are dropped, missing ones left empty."""
+    tc_pr = f'<w:tcPr><w:tcW w:type="dxa" w:w="{width_twips}"/></w:tcPr>'
+    r_pr = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    tcs = [f"<w:tc>{tc_pr}<w:p><w:r>{r_pr}{_docx_run_xml(c)}</w:r></w:p></w:tc>" for c in cells[:cols]]
+    tcs.extend(f"<w:tc>{tc_pr}<w:p/></w:tc>" for _ in range(cols - len(tcs)))
+    return f"<w:tr {_DOCX_W_NS}>{''.join(tcs)}</w:tr>"
 
-def generate_docx(markdown_text: str) -> str:
-    """Generate a DOCX with headings and paragraphs from markdown.
+
+def generate_docx(markdown_text: str) -> bytes:
+    """Generate a DOCX with headings and paragraphs from markdown, returned as bytes.
 
     Uses python-docx; if not available, creates a plain-text DOCX-like via fallback.
     """
@@ -1046,7 +1360,7 @@ def generate_docx(markdown_text: str) -> str:
         # Fallback: write .docx as plain text is not viable; require python-docx
         raise RuntimeError("python-docx not installed. Please add python-docx to requirements.")
 
-    from docx.shared import Inches
+    from docx.shared import Inches, Length
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     from docx.oxml.ns import qn
 
@@ -1097,7 +1411,7 @@ def generate_docx(markdown_text: str) -> str:
             for tl in tbl_lines:
                 row = [c.strip() for c in tl.strip().strip('|').split('|')]
                 # skip markdown separator row
-                if all(set(c) <= set('-: ') and c for c in row):
+                if all(_SEP_CELL_RE.fullmatch(c) for c in row):
                     continue
                 rows.append(row)
             if rows:
@@ -1106,30 +1420,20 @@ def generate_docx(markdown_text: str) -> str:
                 table.autofit = False
                 total_width = section.page_width - section.left_margin - section.right_margin
                 col_w = int(total_width / max(1, cols))
+                # Rows are appended as ready-made <w:tr> XML; the header row's runs are bold
+                tbl = table._tbl
+                col_twips = Length(col_w).twips
                 for irow, r in enumerate(rows):
-                    tr = table.add_row().cells
-                    for j, cell_text in enumerate(r):
-                        tr[j].text = cell_text
-                        tr[j].width = col_w
-                # Header style
-                if table.rows:
-                    hdr = table.rows[0]
-                    for cell in hdr.cells:
-                        for p in cell.paragraphs:
-                            for run in p.runs:
-                                run.bold = True
+                    tbl.append(docx.oxml.parse_xml(_docx_row_xml(r, cols, col_twips, bold=(irow == 0))))
                 # Set borders
-                tbl = table._tbl
                 tblPr = tbl.tblPr
                 tblPr.append(docx.oxml.parse_xml(r'<w:tblBorders xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:top w:val="single" w:sz="6" w:space="0" w:color="9ca3af"/><w:left w:val="single" w:sz="6" w:space="0" w:color="9ca3af"/><w:bottom w:val="single" w:sz="6" w:space="0" w:color="9ca3af"/><w:right w:val="single" w:sz="6" w:space="0" w:color="9ca3af"/><w:insideH w:val="single" w:sz="6" w:space="0" w:color="9ca3af"/><w:insideV w:val="single" w:sz="6" w:space="0" w:color="9ca3af"/></w:tblBorders>'))
             continue
         # default paragraph
         doc.add_paragraph(line.strip())
         i += 1
-    fd, path = tempfile.mkstemp(suffix=".docx")
-    os.close(fd)
-    os.remove(path)
-    doc.save(path)
-    return path
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
 
 
@@ -0,0 +1,42 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from utils.ids import new_id
+
+# Generation is mostly model inference, so a small pool bounds memory while keeping
+# request threads free; finished jobs are kept around for polling up to _MAX_JOBS, and
+# at most _MAX_JOBS may be pending or running at once.
+_MAX_WORKERS = 2
+_MAX_JOBS = 256
+
+_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="sop-job")
+_jobs: "OrderedDict[str, Future]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def submit(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Optional[str]:
+    """Queue `fn` and return its job id, or None if too many jobs are already in flight."""
+    job_id = new_id()
+    with _lock:
+        if sum(1 for f in _jobs.values() if not f.done()) >= _MAX_JOBS:
+            return None
+        _jobs[job_id] = _executor.submit(fn, *args, **kwargs)
+        # Evict the oldest finished jobs first; in-flight ones are never dropped
+        if len(_jobs) > _MAX_JOBS:
+            for old_id in [k for k, f in _jobs.items() if f.done()][: len(_jobs) - _MAX_JOBS]:
+                del _jobs[old_id]
+    return job_id
+
+
+def get_status(job_id: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return None
+    if not future.done():
+        return {"job_id": job_id, "status": "running" if future.running() else "pending"}
+    error = future.exception()
+    if error is not None:
+        return {"job_id": job_id, "status": "failed", "error": str(error)}
+    return {"job_id": job_id, "status": "done", "result": future.result()}
@@ -1,13 +1,43 @@
-import json
 import os
 import re
-from typing import Dict, Any, List, Optional
+from functools import partial
+from typing import Dict, Any, FrozenSet, Iterator, List, Optional, Tuple
+import orjson
+
+_PY_FRAMEWORKS_RE = re.compile(r"fastapi|flask|django", re.IGNORECASE)
+_PY_FRAMEWORK_NAMES = (("fastapi", "FastAPI"), ("flask", "Flask"), ("django", "Django"))
+
+# Route patterns by source extension. Sources are scanned as raw bytes (no decode of the
+# whole file); only matched groups are decoded. Each file is read and scanned once.
+_FASTAPI_ROUTE_RE = re.compile(rb"@app\.(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]")
+_EXPRESS_ROUTE_RE = re.compile(rb"app\.(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]")
+_LARAVEL_ROUTE_RE = re.compile(rb"(?i)Route::(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]")
+# Spring: class-level @RequestMapping base paths and method mappings in one alternation
+_SPRING_ROUTE_RE = re.compile(
+    rb'@RequestMapping\s*\(\s*["\'](?P<base>[^"\']+)["\']'
+    rb'|@(?P<ann>GetMapping|PostMapping|PutMapping|DeleteMapping|PatchMapping)(?:\s*\(\s*["\'](?P<path>[^"\']+)["\']\s*\))?'
+)
+_SPRING_METHODS = {
+    b"GetMapping": "GET",
+    b"PostMapping": "POST",
+    b"PutMapping": "PUT",
+    b"DeleteMapping": "DELETE",
+    b"PatchMapping": "PATCH"
+}
+# Keep in sync with _EXT_HANDLERS, which needs the scanner functions defined below
+_ROUTE_SOURCE_EXTS = frozenset((".py", ".js", ".ts", ".php", ".java"))
+# Dependency, VCS and build output directories never hold the project's own routes
+_SKIP_DIRS = frozenset(("node_modules", ".git", "dist", "build", "coverage", ".next", "__pycache__", ".venv"))
+# Minified, bundled and vendored sources are generated or third-party: too big to scan and
+# any route-like strings in them are false positives
+_GENERATED_SOURCE_RE = re.compile(r"\.min\.|\.bundle\.|vendor\.")
+_MAX_ROUTE_SOURCE_BYTES = 512 * 1024
 
 
 def _read_json(path: str):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     except Exception:
         return None
 
@@ -20,6 +50,46 @@ def _read_text(path: str) -> str | None:
         return None
 
 
+def _read_bytes(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except Exception:
+        return b""
+
+
+def _iter_source_files(project_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yield (path, extension) of route source files, top-down like os.walk, pruning _SKIP_DIRS
+    and skipping generated or oversized sources."""
+    stack = [project_dir]
+    while stack:
+        current = stack.pop()
+        subdirs: List[str] = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext not in _ROUTE_SOURCE_EXTS or _GENERATED_SOURCE_RE.search(entry.name):
+                        continue
+                    try:
+                        if entry.stat().st_size > _MAX_ROUTE_SOURCE_BYTES:
+                            continue
+                    except OSError:
+                        continue
+                    yield entry.path, ext
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
 def _maybe_project_root(project_dir: str) -> str:
     entries = [e for e in os.listdir(project_dir) if not e.startswith('.')]
     if len(entries) == 1:
@@ -29,20 +99,33 @@ def _maybe_project_root(project_dir: str) -> str:
     return project_dir
 
 
-def _find_first(project_dir: str, filename: str) -> Optional[str]:
-    for root, _, files in os.walk(project_dir):
-        if filename in files:
-            return os.path.join(root, filename)
-    return None
+# Manifest files the metadata extractors look for; all are located in a single walk
+_MANIFEST_FILES = frozenset(("package.json", "requirements.txt", "pyproject.toml", "pom.xml", "Dockerfile", ".env.example"))
+
 
+def _locate_files(project_dir: str, targets: FrozenSet[str] = _MANIFEST_FILES) -> Dict[str, str]:
+    """Map each target filename to its first occurrence in a top-down walk of project_dir."""
+    found: Dict[str, str] = {}
+    pending = set(targets)
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS]
+        for filename in pending.intersection(files):
+            found[filename] = os.path.join(root, filename)
+        pending.difference_update(found)
+        if not pending:
+            break
+    return found
 
-def detect_language_and_framework(project_dir: str) -> Dict[str, Any]:
+
+def detect_language_and_framework(project_dir: str, found: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     project_dir = _maybe_project_root(project_dir)
+    if found is None:
+        found = _locate_files(project_dir)
     indicators: List[str] = os.listdir(project_dir)
     languages: List[str] = []
     frameworks: List[str] = []
 
-    pkg_path = _find_first(project_dir, "package.json")
+    pkg_path = found.get("package.json")
     if pkg_path:
         languages.append("JavaScript/TypeScript")
         pkg = _read_json(pkg_path) or {}
@@ -54,35 +137,33 @@ def detect_language_and_framework(project_dir: str) -> Dict[str, Any]:
         if "vite" in deps:
             frameworks.append("Vite")
 
-    reqs_path = _find_first(project_dir, "requirements.txt")
-    pyproject = _find_first(project_dir, "pyproject.toml")
+    reqs_path = found.get("requirements.txt")
+    pyproject = found.get("pyproject.toml")
     if reqs_path or pyproject:
         languages.append("Python")
         reqs = _read_text(reqs_path) if reqs_path else None
-        if reqs and re.search(r"fastapi|flask|django", reqs, re.IGNORECASE):
-            if re.search(r"fastapi", reqs, re.IGNORECASE):
-                frameworks.append("FastAPI")
-            if re.search(r"flask", reqs, re.IGNORECASE):
-                frameworks.append("Flask")
-            if re.search(r"django", reqs, re.IGNORECASE):
-                frameworks.append("Django")
-
-    pom = _find_first(project_dir, "pom.xml")
+        if reqs:
+            hits = {m.lower() for m in _PY_FRAMEWORKS_RE.findall(reqs)}
+            frameworks.extend(name for key, name in _PY_FRAMEWORK_NAMES if key in hits)
+
+    pom = found.get("pom.xml")
     if pom:
         languages.append("Java")
         frameworks.append("Spring (possible)")
 
-    docker = _find_first(project_dir, "Dockerfile")
+    docker = found.get("Dockerfile")
     if docker:
         frameworks.append("Docker")
 
-    return {"languages": list(set(languages)), "frameworks": list(set(frameworks))}
+    return {"languages": list(dict.fromkeys(languages)), "frameworks": list(dict.fromkeys(frameworks))}
 
 
-def parse_dependencies(project_dir: str) -> Dict[str, Any]:
+def parse_dependencies(project_dir: str, found: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     project_dir = _maybe_project_root(project_dir)
+    if found is None:
+        found = _locate_files(project_dir)
     data: Dict[str, Any] = {}
-    pkg_path = _find_first(project_dir, "package.json")
+    pkg_path = found.get("package.json")
     if pkg_path:
         pkg = _read_json(pkg_path) or {}
         data["node"] = {
@@ -92,103 +173,96 @@ def parse_dependencies(project_dir: str) -> Dict[str, Any]:
             "devDependencies": pkg.get("devDependencies", {}),
             "scripts": pkg.get("scripts", {}),
         }
-    reqs_path = _find_first(project_dir, "requirements.txt")
+    reqs_path = found.get("requirements.txt")
     if reqs_path:
         reqs = _read_text(reqs_path)
         if reqs:
-            data["python"] = {"requirements": [line.strip() for line in reqs.splitlines() if line.strip() and not line.startswith("#")]}
-    pom_path = _find_first(project_dir, "pom.xml")
+            data["python"] = {"requirements": [s for s in (line.strip() for line in reqs.split("\n")) if s and s[0] != "#"]}
+    pom_path = found.get("pom.xml")
     if pom_path:
         data["java"] = {"pom.xml": True}
-    docker = _find_first(project_dir, "Dockerfile")
+    docker = found.get("Dockerfile")
     if docker:
         data["docker"] = {"dockerfile": True}
-    env_example_path = _find_first(project_dir, ".env.example")
+    env_example_path = found.get(".env.example")
     if env_example_path:
         data["env"] = {"example": _read_text(env_example_path)}
     return data
 
 
+def _simple_routes(pattern: "re.Pattern[bytes]", content: bytes, rel: str) -> List[Dict[str, str]]:
+    return [
+        {"method": m.group(1).upper().decode(), "path": m.group(2).decode("utf-8", "replace"), "file": rel}
+        for m in pattern.finditer(content)
+    ]
+
+
+def _spring_routes(content: bytes, rel: str) -> List[Dict[str, str]]:
+    # The last @RequestMapping in the file is the base for every method mapping in it
+    base_path = ""
+    mappings: List[Tuple[bytes, str]] = []
+    for match in _SPRING_ROUTE_RE.finditer(content):
+        if match.group("base") is not None:
+            base_path = match.group("base").decode("utf-8", "replace")
+        else:
+            mappings.append((match.group("ann"), (match.group("path") or b"").decode("utf-8", "replace")))
+
+    found: List[Dict[str, str]] = []
+    for method_annotation, path in mappings:
+        http_method = _SPRING_METHODS.get(method_annotation, "GET")
+
+        # Combine base path with method path
+        if base_path and path:
+            full_path = base_path.rstrip("/") + "/" + path.lstrip("/")
+        elif base_path:
+            full_path = base_path
+        elif path:
+            full_path = path
+        else:
+            full_path = "/"
+
+        if not full_path.startswith("/"):
+            full_path = "/" + full_path
+
+        found.append({
+            "method": http_method,
+            "path": full_path,
+            "file": rel
+        })
+    return found
+
+
+# Source extension -> (routes key, scanner); each file runs exactly one scan
+_EXT_HANDLERS = {
+    ".py": ("fastapi", partial(_simple_routes, _FASTAPI_ROUTE_RE)),
+    ".js": ("express", partial(_simple_routes, _EXPRESS_ROUTE_RE)),
+    ".ts": ("express", partial(_simple_routes, _EXPRESS_ROUTE_RE)),
+    ".php": ("laravel", partial(_simple_routes, _LARAVEL_ROUTE_RE)),
+    ".java": ("spring", _spring_routes),
+}
+
+
 def extract_api_routes(project_dir: str) -> Dict[str, Any]:
     project_dir = _maybe_project_root(project_dir)
     routes: Dict[str, Any] = {}
-    
-    for root, _, files in os.walk(project_dir):
-        for filename in files:
-            full = os.path.join(root, filename)
-            content = _read_text(full) or ""
-            
-            # FastAPI routes
-            if filename.endswith(".py"):
-                for match in re.finditer(r"@app\.(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]", content):
-                    method, path = match.group(1).upper(), match.group(2)
-                    routes.setdefault("fastapi", []).append({"method": method, "path": path, "file": os.path.relpath(full, project_dir)})
-            
-            # Express routes
-            if filename.endswith(".js") or filename.endswith(".ts"):
-                for match in re.finditer(r"app\.(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]", content):
-                    method, path = match.group(1).upper(), match.group(2)
-                    routes.setdefault("express", []).append({"method": method, "path": path, "file": os.path.relpath(full, project_dir)})
-            
-            # Spring Boot routes
-            if filename.endswith(".java"):
-                # Find @RequestMapping base path
-                base_path = ""
-                for match in re.finditer(r'@RequestMapping\s*\(\s*["\']([^"\']+)["\']', content):
-                    base_path = match.group(1)
-                
-                # Find individual method mappings - match single line patterns
-                for match in re.finditer(r'@(GetMapping|PostMapping|PutMapping|DeleteMapping|PatchMapping)(?:\s*\(\s*["\']([^"\']+)["\']\s*\))?', content, re.MULTILINE):
-                    method_annotation = match.group(1)
-                    path = match.group(2) if match.group(2) else ""
-                    
-                    # Convert annotation to HTTP method
-                    method_map = {
-                        "GetMapping": "GET",
-                        "PostMapping": "POST", 
-                        "PutMapping": "PUT",
-                        "DeleteMapping": "DELETE",
-                        "PatchMapping": "PATCH"
-                    }
-                    http_method = method_map.get(method_annotation, "GET")
-                    
-                    # Combine base path with method path
-                    if base_path and path:
-                        full_path = base_path.rstrip("/") + "/" + path.lstrip("/")
-                    elif base_path:
-                        full_path = base_path
-                    elif path:
-                        full_path = path
-                    else:
-                        full_path = "/"
-                    
-                    if not full_path.startswith("/"):
-                        full_path = "/" + full_path
-                    
-                    routes.setdefault("spring", []).append({
-                        "method": http_method, 
-                        "path": full_path, 
-                        "file": os.path.relpath(full, project_dir)
-                    })
-
-            # Laravel routes (PHP)
-            if filename.endswith(".php"):
-                # Match Route::get('/path', ...) style definitions
-                for match in re.finditer(r"Route::(get|post|put|delete|patch)\(\s*['\"]([^'\"]+)['\"]", content, re.IGNORECASE):
-                    method, path = match.group(1).upper(), match.group(2)
-                    routes.setdefault("laravel", []).append({
-                        "method": method,
-                        "path": path,
-                        "file": os.path.relpath(full, project_dir)
-                    })
-    
+
+    for full, ext in _iter_source_files(project_dir):
+        content = _read_bytes(full)
+        rel = os.path.relpath(full, project_dir)
+
+        kind, scan = _EXT_HANDLERS[ext]
+        found = scan(content, rel)
+        if found:
+            routes.setdefault(kind, []).extend(found)
+
     return routes
 
 
 def extract_project_metadata(project_dir: str) -> Dict[str, Any]:
     project_dir = _maybe_project_root(project_dir)
-    info = detect_language_and_framework(project_dir)
-    deps = parse_dependencies(project_dir)
+    found = _locate_files(project_dir)
+    info = detect_language_and_framework(project_dir, found)
+    deps = parse_dependencies(project_dir, found)
     routes = extract_api_routes(project_dir)
     project_name = None
     if "node" in deps and deps["node"].get("name"):
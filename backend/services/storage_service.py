@@ -1,95 +1,301 @@
-import json
 import os
-from typing import Optional, Dict, Any, List
+import re
+import threading
+import orjson
+from functools import lru_cache
+from pydantic import TypeAdapter
+from typing import Optional, Dict, Any, List, NamedTuple, Set, Tuple
+from urllib.parse import quote, unquote
 from config import settings
 from models.schemas import SOPDocument, SOPSection, ListItem
 
+# Stored JSON is only ever read back by code, so it is written compact
+_JSON_OPTS = orjson.OPT_NON_STR_KEYS
+# SOPs are serialized straight from the model by pydantic-core, with no intermediate dict
+_SOP_ADAPTER = TypeAdapter(SOPDocument)
+# save_sop writes id and project_name ahead of sections, so both are in the first few
+# bytes of every SOP file; anything else falls back to a full parse
+_SOP_HEADER_RE = re.compile(
+    rb'\A\{\s*"id"\s*:\s*("(?:[^"\\]|\\.)*")\s*,\s*"project_name"\s*:\s*("(?:[^"\\]|\\.)*")'
+)
+_SOP_HEADER_PEEK_BYTES = 4096
+# SOP files are named `{id}__{quoted project_name}` so listings can be answered from the
+# directory alone; names that quote to more than _SOP_SLUG_MAX chars keep the bare id
+_SOP_NAME_SEP = "__"
+_SOP_SLUG_MAX = 64
+
+
+# Directories already created by _ensure_dir in this process
+_ensured_dirs: Set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    """os.makedirs(path, exist_ok=True), done at most once per directory per process."""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+def _file_key(path: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for `path`, or None if it is not a file.
+
+    Used as the cache key for the loaders below: any save_* rewrites the file,
+    which changes the key, so stale entries simply stop being hit.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Cached values are shared between callers and must be treated as read-only.
+@lru_cache(maxsize=256)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@lru_cache(maxsize=256)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=256)
+def _load_sop_cached(path: str, mtime_ns: int, size: int) -> SOPDocument:
+    data = _read_json_cached(path, mtime_ns, size)
+    # Files are written by save_sop, so trust their shape instead of re-validating
+    sections = [SOPSection(**s) for s in data.get("sections", [])]
+    return SOPDocument.model_construct(id=data["id"], project_name=data.get("project_name", data["id"]), sections=sections, metadata=data.get("metadata", {}))
+
+
+@lru_cache(maxsize=1024)
+def _peek_sop_header(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    """Return (id, project_name) of a SOP file without parsing its sections."""
+    with open(path, "rb") as f:
+        head = f.read(_SOP_HEADER_PEEK_BYTES)
+    m = _SOP_HEADER_RE.match(head)
+    if m is not None:
+        return orjson.loads(m.group(1)), orjson.loads(m.group(2))
+    data = _read_json_cached(path, mtime_ns, size)
+    return data["id"], data.get("project_name", data["id"])
+
+
+def _sop_stem(sop: SOPDocument) -> str:
+    slug = quote(sop.project_name, safe="")
+    return f"{sop.id}{_SOP_NAME_SEP}{slug}" if len(slug) <= _SOP_SLUG_MAX else sop.id
+
+
+# What reading a SOP header can raise for an unreadable, truncated or malformed file;
+# scans skip such files so one bad file can't break every SOP operation
+_SOP_HEADER_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+
+def _sop_entry_header(entry: os.DirEntry) -> Tuple[str, str]:
+    """Return (id, project_name) for a SOP .json entry, from its filename when it carries one."""
+    sop_id, sep, slug = entry.name[:-5].partition(_SOP_NAME_SEP)
+    if sep:
+        return sop_id, unquote(slug)
+    st = entry.stat()
+    return _peek_sop_header(entry.path, st.st_mtime_ns, st.st_size)
+
+
+_SopIndex = Tuple[Dict[str, str], Dict[str, List[str]]]
+
+
+# Keyed like _list_sops_cached below; maps each SOP id to its file stem, and each
+# project_name to the stems of all its SOPs
+@lru_cache(maxsize=1)
+def _sop_index_cached(dir_mtime_ns: int) -> _SopIndex:
+    stems: Dict[str, str] = {}
+    by_project: Dict[str, List[str]] = {}
+    with os.scandir(settings.SOPS_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                sop_id, project_name = _sop_entry_header(entry)
+            except _SOP_HEADER_ERRORS:
+                continue
+            stem = entry.name[:-5]
+            stems[sop_id] = stem
+            by_project.setdefault(project_name, []).append(stem)
+    return stems, by_project
+
+
+def _sop_index() -> _SopIndex:
+    try:
+        return _sop_index_cached(os.stat(settings.SOPS_DIR).st_mtime_ns)
+    except OSError:
+        return {}, {}
+
+
+def _sop_path(sop_id: str, ext: str) -> str:
+    stem = _sop_index()[0].get(sop_id, sop_id)
+    return os.path.join(settings.SOPS_DIR, f"{stem}{ext}")
+
+
+def _clear_sop_caches() -> None:
+    _list_sops_cached.cache_clear()
+    _sop_index_cached.cache_clear()
+
+
+# Project ids are generated by utils.ids.new_id; anything else never names a project
+# directory, which also keeps ids like "../x" from escaping PROJECTS_DIR
+_PROJECT_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class _ProjectPaths(NamedTuple):
+    project_dir: str
+    metadata: str
+    docs_dir: str
+    docs_inputs: str
+    docs_openapi: str
+    docs_markdown: str
+
+
+@lru_cache(maxsize=1024)
+def _project_paths_cached(projects_dir: str, project_id: str) -> Optional[_ProjectPaths]:
+    if _PROJECT_ID_RE.fullmatch(project_id) is None:
+        return None
+    project_dir = os.path.join(projects_dir, project_id)
+    docs_dir = os.path.join(project_dir, "docs")
+    return _ProjectPaths(
+        project_dir=project_dir,
+        metadata=os.path.join(project_dir, "metadata.json"),
+        docs_dir=docs_dir,
+        docs_inputs=os.path.join(docs_dir, "inputs.json"),
+        docs_openapi=os.path.join(docs_dir, "openapi.json"),
+        docs_markdown=os.path.join(docs_dir, "docs.md"),
+    )
+
+
+def _project_paths(project_id: str) -> Optional[_ProjectPaths]:
+    """Validated, precomputed storage paths for `project_id`, or None if the id is invalid."""
+    return _project_paths_cached(settings.PROJECTS_DIR, project_id)
+
+
+def _require_project_paths(project_id: str) -> _ProjectPaths:
+    paths = _project_paths(project_id)
+    if paths is None:
+        raise ValueError(f"Invalid project id: {project_id!r}")
+    return paths
+
 
 def get_project_dir(project_id: str) -> Optional[str]:
-    candidate = os.path.join(settings.PROJECTS_DIR, project_id)
-    return candidate if os.path.isdir(candidate) else None
+    paths = _project_paths(project_id)
+    return paths.project_dir if paths is not None and os.path.isdir(paths.project_dir) else None
 
 
 def save_project_metadata(project_id: str, metadata: Dict[str, Any]) -> None:
-    path = os.path.join(settings.PROJECTS_DIR, project_id, "metadata.json")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2)
+    paths = _require_project_paths(project_id)
+    _ensure_dir(paths.project_dir)
+    with open(paths.metadata, "wb") as f:
+        f.write(orjson.dumps(metadata, option=_JSON_OPTS))
 
 
 def load_project_metadata(project_id: str) -> Dict[str, Any]:
-    path = os.path.join(settings.PROJECTS_DIR, project_id, "metadata.json")
-    if not os.path.isfile(path):
+    paths = _project_paths(project_id)
+    if paths is None:
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    path = paths.metadata
+    key = _file_key(path)
+    if key is None:
+        return {}
+    return _read_json_cached(path, *key)
+
+
+def _write_tmp(path: str, data: bytes) -> str:
+    """Write `data` to a sibling temp file with one unbuffered write loop; returns its path."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return tmp
 
 
 def save_sop(sop: SOPDocument) -> None:
-    json_path = os.path.join(settings.SOPS_DIR, f"{sop.id}.json")
-    md_path = os.path.join(settings.SOPS_DIR, f"{sop.id}.md")
-    os.makedirs(settings.SOPS_DIR, exist_ok=True)
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(sop.model_dump(), f, indent=2)
+    _ensure_dir(settings.SOPS_DIR)
+    old_json_path = _sop_path(sop.id, ".json")
+    stem = _sop_stem(sop)
+    json_path = os.path.join(settings.SOPS_DIR, f"{stem}.json")
+    md_path = os.path.join(settings.SOPS_DIR, f"{stem}.md")
     from .ai_service import to_markdown
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(to_markdown(sop))
+    # Both files are written to temp names and renamed into place, markdown first, so a
+    # concurrent list/load never sees a half-written JSON or a JSON without its markdown
+    md_tmp = _write_tmp(md_path, to_markdown(sop).encode("utf-8"))
+    json_tmp = _write_tmp(json_path, _SOP_ADAPTER.dump_json(sop))
+    os.replace(md_tmp, md_path)
+    os.replace(json_tmp, json_path)
+    # Re-saving under a new project_name renames the files; drop the old pair
+    if old_json_path != json_path:
+        _remove_sop_files(os.path.basename(old_json_path)[:-5])
+    _clear_sop_caches()
 
 
 def load_sop(sop_id: str) -> Optional[SOPDocument]:
-    path = os.path.join(settings.SOPS_DIR, f"{sop_id}.json")
-    if not os.path.isfile(path):
+    path = _sop_path(sop_id, ".json")
+    key = _file_key(path)
+    if key is None:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    sections = [SOPSection(**s) for s in data.get("sections", [])]
-    return SOPDocument(id=data["id"], project_name=data.get("project_name", data["id"]), sections=sections, metadata=data.get("metadata", {}))
+    return _load_sop_cached(path, *key)
+
+
+def get_sop_markdown_path(sop_id: str) -> Optional[str]:
+    path = _sop_path(sop_id, ".md")
+    return path if os.path.isfile(path) else None
 
 
 def load_sop_markdown(sop_id: str) -> Optional[str]:
-    path = os.path.join(settings.SOPS_DIR, f"{sop_id}.md")
-    if not os.path.isfile(path):
+    path = _sop_path(sop_id, ".md")
+    key = _file_key(path)
+    if key is None:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+    return _read_text_cached(path, *key)
 
 
 def list_sops() -> List[ListItem]:
+    try:
+        dir_mtime_ns = os.stat(settings.SOPS_DIR).st_mtime_ns
+    except OSError:
+        return []
+    return list(_list_sops_cached(dir_mtime_ns))
+
+
+# Keyed by the SOPS_DIR mtime, which moves whenever a SOP file is created or removed;
+# save_sop/delete_sop also clear it so in-process changes are never missed.
+@lru_cache(maxsize=1)
+def _list_sops_cached(dir_mtime_ns: int) -> Tuple[ListItem, ...]:
     items: List[ListItem] = []
-    if not os.path.isdir(settings.SOPS_DIR):
-        return items
-
-    # Collect all SOPs
-    all_sops: List[SOPDocument] = []
-    for filename in os.listdir(settings.SOPS_DIR):
-        if filename.endswith(".json"):
-            sop = load_sop(filename[:-5])
-            if sop:
-                all_sops.append(sop)
-
-    # De-duplicate by project_name, keep the most recent by file mtime
-    latest_by_name: Dict[str, SOPDocument] = {}
-    modified_ts_by_id: Dict[str, float] = {}
-    for sop in all_sops:
-        json_path = os.path.join(settings.SOPS_DIR, f"{sop.id}.json")
-        mtime = os.path.getmtime(json_path)
-        modified_ts_by_id[sop.id] = mtime
-        key = sop.project_name
-        prev = latest_by_name.get(key)
-        if prev is None:
-            latest_by_name[key] = sop
-        else:
-            prev_mtime = os.path.getmtime(os.path.join(settings.SOPS_DIR, f"{prev.id}.json"))
-            if mtime >= prev_mtime:
-                latest_by_name[key] = sop
-
-    for sop in latest_by_name.values():
-        items.append(ListItem(id=sop.id, project_name=sop.project_name, modified_ts=modified_ts_by_id.get(sop.id, 0.0)))
+
+    # One scandir pass: id/project_name come from each filename (legacy files get a header
+    # peek), and the stat is only for the mtime; keeps the most recent per project_name
+    latest_by_name: Dict[str, Tuple[str, float]] = {}
+    with os.scandir(settings.SOPS_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                st = entry.stat()
+                sop_id, key = _sop_entry_header(entry)
+            except _SOP_HEADER_ERRORS:
+                continue
+            prev = latest_by_name.get(key)
+            if prev is None or st.st_mtime >= prev[1]:
+                latest_by_name[key] = (sop_id, st.st_mtime)
+
+    for project_name, (sop_id, mtime) in latest_by_name.items():
+        items.append(ListItem(id=sop_id, project_name=project_name, modified_ts=mtime))
 
     # Sort alphabetically by project_name
     # Sort alphabetically for stability, but the frontend computes latest by timestamp
     items.sort(key=lambda x: x.project_name.lower())
-    return items
+    return tuple(items)
 
 
 def delete_sop(sop_id: str) -> bool:
@@ -100,37 +306,39 @@ def delete_sop(sop_id: str) -> bool:
     one card per project (latest), so deleting it should remove the
     project from the list entirely.
     """
-    target = load_sop(sop_id)
-    removed = False
-
-    # If we know the project_name, remove all SOPs that share it
-    if target is not None:
-        project_name = target.project_name
-        if os.path.isdir(settings.SOPS_DIR):
-            for filename in os.listdir(settings.SOPS_DIR):
-                if not filename.endswith('.json'):
-                    continue
-                sop = load_sop(filename[:-5])
-                if sop and sop.project_name == project_name:
-                    json_path = os.path.join(settings.SOPS_DIR, f"{sop.id}.json")
-                    md_path = os.path.join(settings.SOPS_DIR, f"{sop.id}.md")
-                    if os.path.isfile(json_path):
-                        os.remove(json_path)
-                        removed = True
-                    if os.path.isfile(md_path):
-                        os.remove(md_path)
-                        removed = True
+    target_path = _sop_path(sop_id, ".json")
+    key = _file_key(target_path)
+
+    project_name: Optional[str] = None
+    if key is not None:
+        try:
+            _, project_name = _peek_sop_header(target_path, *key)
+        except _SOP_HEADER_ERRORS:
+            pass
+
+    # If we know the project_name, remove all SOPs that share it, as listed by the
+    # cached SOP index (the same one _sop_path just consulted), so nothing is rescanned
+    if project_name is not None:
+        removed = False
+        for stem in _sop_index()[1].get(project_name, ()):
+            removed = _remove_sop_files(stem) or removed
+        _clear_sop_caches()
         return removed
 
-    # Fallback: delete by id only
-    json_path = os.path.join(settings.SOPS_DIR, f"{sop_id}.json")
-    md_path = os.path.join(settings.SOPS_DIR, f"{sop_id}.md")
-    if os.path.isfile(json_path):
-        os.remove(json_path)
-        removed = True
-    if os.path.isfile(md_path):
-        os.remove(md_path)
-        removed = True
+    # Fallback: delete by id only (also used when the target file is unreadable)
+    removed = _remove_sop_files(os.path.basename(target_path)[:-5])
+    _clear_sop_caches()
+    return removed
+
+
+def _remove_sop_files(stem: str) -> bool:
+    removed = False
+    for ext in (".json", ".md"):
+        try:
+            os.remove(os.path.join(settings.SOPS_DIR, f"{stem}{ext}"))
+            removed = True
+        except FileNotFoundError:
+            pass
     return removed
 
 
@@ -138,50 +346,63 @@ def delete_sop(sop_id: str) -> bool:
 # API Docs persistence
 # ----------------------
 
-def _docs_dir(project_id: str) -> str:
-    return os.path.join(settings.PROJECTS_DIR, project_id, "docs")
+def _docs_file(project_id: str, field: str) -> Optional[str]:
+    paths = _project_paths(project_id)
+    return getattr(paths, field) if paths is not None else None
+
+
+def _existing_docs_file(project_id: str, field: str) -> Optional[str]:
+    path = _docs_file(project_id, field)
+    return path if path is not None and os.path.isfile(path) else None
+
+
+def _save_docs_file(project_id: str, field: str, data: bytes) -> None:
+    paths = _require_project_paths(project_id)
+    _ensure_dir(paths.docs_dir)
+    with open(getattr(paths, field), "wb") as f:
+        f.write(data)
 
 
 def save_docs_inputs(project_id: str, data: Dict[str, Any]) -> None:
-    path = os.path.join(_docs_dir(project_id), "inputs.json")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    _save_docs_file(project_id, "docs_inputs", orjson.dumps(data, option=_JSON_OPTS))
 
 
 def load_docs_inputs(project_id: str) -> Dict[str, Any] | None:
-    path = os.path.join(_docs_dir(project_id), "inputs.json")
-    if not os.path.isfile(path):
+    path = _docs_file(project_id, "docs_inputs")
+    key = _file_key(path) if path is not None else None
+    if key is None:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _read_json_cached(path, *key)
 
 
 def save_docs_openapi(project_id: str, openapi: Dict[str, Any]) -> None:
-    path = os.path.join(_docs_dir(project_id), "openapi.json")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(openapi, f, indent=2)
+    # Serialized once here so /docs/openapi.json can stream the file as-is
+    _save_docs_file(project_id, "docs_openapi", orjson.dumps(openapi, option=_JSON_OPTS))
+
+
+def get_docs_openapi_path(project_id: str) -> Optional[str]:
+    return _existing_docs_file(project_id, "docs_openapi")
 
 
 def load_docs_openapi(project_id: str) -> Dict[str, Any] | None:
-    path = os.path.join(_docs_dir(project_id), "openapi.json")
-    if not os.path.isfile(path):
+    path = _docs_file(project_id, "docs_openapi")
+    key = _file_key(path) if path is not None else None
+    if key is None:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _read_json_cached(path, *key)
 
 
 def save_docs_markdown(project_id: str, md: str) -> None:
-    path = os.path.join(_docs_dir(project_id), "docs.md")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(md)
+    _save_docs_file(project_id, "docs_markdown", md.encode("utf-8"))
+
+
+def get_docs_markdown_path(project_id: str) -> Optional[str]:
+    return _existing_docs_file(project_id, "docs_markdown")
 
 
 def load_docs_markdown(project_id: str) -> str | None:
-    path = os.path.join(_docs_dir(project_id), "docs.md")
-    if not os.path.isfile(path):
+    path = _docs_file(project_id, "docs_markdown")
+    key = _file_key(path) if path is not None else None
+    if key is None:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+    return _read_text_cached(path, *key)
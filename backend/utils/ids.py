@@ -0,0 +1,23 @@
+import os
+import time
+import uuid
+
+_VERSION_MASK = ~(0xF << 76) & ~(0x3 << 62)
+_VERSION_BITS = (0x7 << 76) | (0x2 << 62)
+
+
+def _uuid7() -> uuid.UUID:
+    # RFC 9562 layout: 48-bit unix ms timestamp, version 7, variant 10, random tail
+    ts_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = ((ts_ms & 0xFFFFFFFFFFFF) << 80) | rand
+    return uuid.UUID(int=(value & _VERSION_MASK) | _VERSION_BITS)
+
+
+# Python 3.14+ ships uuid.uuid7; fall back to the local implementation before that
+uuid7 = getattr(uuid, "uuid7", _uuid7)
+
+
+def new_id() -> str:
+    """Time-ordered id string, so ids (and the files named after them) sort by creation."""
+    return str(uuid7())
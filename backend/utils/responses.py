@@ -0,0 +1,14 @@
+from typing import Any
+import orjson
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Used for server-built payloads that are already JSON-compatible, so they can
+    skip FastAPI's response validation and `jsonable_encoder` pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)